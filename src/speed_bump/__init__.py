@@ -13,6 +13,7 @@ Environment Variables:
     SPEED_BUMP_FREQUENCY: Trigger every Nth matching call (default: 1)
     SPEED_BUMP_START_MS: Milliseconds after process start before enabling
     SPEED_BUMP_DURATION_MS: Duration in milliseconds (0 = indefinite)
+    SPEED_BUMP_SLEEP: 1 = sleep through most of long delays instead of spinning
 
 Example:
     >>> import speed_bump
@@ -24,9 +25,11 @@ Example:
 
 from speed_bump._config import Config, ConfigError, load_config
 from speed_bump._core import (
+    clock_overhead_ns,
     get_clock_overhead_ns,
     get_min_delay_ns,
     is_calibrated,
+    min_delay_ns,
     spin_delay_ns,
 )
 from speed_bump._monitoring import (
@@ -61,7 +64,3 @@ __all__ = [
     "spin_delay_ns",
     "uninstall",
 ]
-
-# Expose calibrated values as module attributes for convenience
-clock_overhead_ns: int = get_clock_overhead_ns()
-min_delay_ns: int = get_min_delay_ns()
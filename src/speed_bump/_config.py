@@ -6,6 +6,8 @@ Environment Variables:
     SPEED_BUMP_FREQUENCY: Trigger every Nth matching call (default: 1)
     SPEED_BUMP_START_MS: Milliseconds after process start before enabling (default: 0)
     SPEED_BUMP_DURATION_MS: Duration in milliseconds, 0 = indefinite (default: 0)
+    SPEED_BUMP_SLEEP: 1 = sleep through most of delays over 200us instead of spinning
+        (default: 0). Python 3.12+ only; the setprofile backend always spins.
 """
 
 from __future__ import annotations
@@ -13,11 +15,10 @@ from __future__ import annotations
 import os
 import sys
 import time
-from dataclasses import dataclass
-from pathlib import Path
+from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
 
-from speed_bump._core import get_min_delay_ns
+from speed_bump._core import min_delay_ns
 from speed_bump._patterns import TargetPattern, load_targets
 
 if TYPE_CHECKING:
@@ -28,6 +29,25 @@ if TYPE_CHECKING:
 # We use time.time_ns at import because time.monotonic_ns doesn't have a defined epoch
 _PROCESS_START_NS: int = time.time_ns()
 
+# Stand-in for a missing end time in window comparisons
+_INT64_MAX = (1 << 63) - 1
+
+# Integer settings as (environment variable, default, minimum)
+_INT_SETTINGS: tuple[tuple[str, int, int], ...] = (
+    ("SPEED_BUMP_DELAY_NS", 1000, 0),
+    ("SPEED_BUMP_FREQUENCY", 1, 1),
+    ("SPEED_BUMP_START_MS", 0, 0),
+    ("SPEED_BUMP_DURATION_MS", 0, 0),
+    ("SPEED_BUMP_SLEEP", 0, 0),
+)
+
+# Environment variables that determine the configuration
+_ENV_VARS = ("SPEED_BUMP_TARGETS", *(name for name, _, _ in _INT_SETTINGS))
+
+# Last loaded configuration, keyed by the values of _ENV_VARS it was built from
+# and the stat stamp of the targets file (see _file_stamp)
+_cached_config: tuple[tuple[tuple[str | None, ...], tuple[int, int] | None], Config] | None = None
+
 
 @dataclass(frozen=True, slots=True)
 class Config:
@@ -51,6 +71,20 @@ class Config:
     end_ns: int | None
     """Absolute time (time.time_ns) when slowdown should end, or None for indefinite."""
 
+    sleep: bool = False
+    """Whether long delays sleep for most of their duration instead of spinning.
+
+    Only honoured by the PEP 669 backend (Python 3.12+); the setprofile
+    backend always spins.
+    """
+
+    _end_ns_or_max: int = field(init=False, repr=False, compare=False)
+    """end_ns with None replaced by INT64_MAX, so the window is two compares."""
+
+    def __post_init__(self) -> None:
+        end_ns = self.end_ns if self.end_ns is not None else _INT64_MAX
+        object.__setattr__(self, "_end_ns_or_max", end_ns)
+
     def is_in_window(self, now_ns: int | None = None) -> bool:
         """Check if the current time is within the active window.
 
@@ -60,30 +94,22 @@ class Config:
         Returns:
             True if slowdown should be active.
         """
-        if not self.enabled:
-            return False
-
         if now_ns is None:
             now_ns = time.time_ns()
 
-        if now_ns < self.start_ns:
-            return False
-
-        if self.end_ns is not None and now_ns >= self.end_ns:
-            return False
-
-        return True
+        return self.enabled and self.start_ns <= now_ns < self._end_ns_or_max
 
 
 class ConfigError(Exception):
     """Error in configuration."""
 
 
-def _parse_int(name: str, default: int, min_value: int = 0) -> int:
+def _parse_int(name: str, value_str: str | None, default: int, min_value: int = 0) -> int:
     """Parse an integer environment variable.
 
     Args:
-        name: Environment variable name.
+        name: Environment variable name (for error messages).
+        value_str: The variable's value, or None if not set.
         default: Default value if not set.
         min_value: Minimum allowed value.
 
@@ -93,7 +119,6 @@ def _parse_int(name: str, default: int, min_value: int = 0) -> int:
     Raises:
         ConfigError: If the value is invalid.
     """
-    value_str = os.environ.get(name)
     if value_str is None:
         return default
 
@@ -111,15 +136,56 @@ def _parse_int(name: str, default: int, min_value: int = 0) -> int:
 def load_config() -> Config:
     """Load configuration from environment variables.
 
+    The result is cached: repeated calls with unchanged SPEED_BUMP_*
+    variables and an unmodified targets file (same mtime and size) return
+    the same Config without re-reading the targets file.
+
     Returns:
         A Config object with the parsed configuration.
 
     Raises:
         ConfigError: If configuration is invalid.
     """
-    # Check if targets file is specified
-    targets_path = os.environ.get("SPEED_BUMP_TARGETS")
+    global _cached_config
+
+    # The integers are only parsed on a cache miss, so a hit costs these
+    # lookups and one stat
+    env_values = tuple(map(os.environ.get, _ENV_VARS))
+    key = (env_values, _file_stamp(env_values[0]))
 
+    cached = _cached_config
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    config = _load_config(env_values[0], env_values[1:])
+    _cached_config = (key, config)
+    return config
+
+
+def _file_stamp(path: str | None) -> tuple[int, int] | None:
+    """Return (mtime_ns, size) of a file, or None if unset or unreadable."""
+    if not path:
+        return None
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _clear_cache() -> None:
+    """Forget the cached configuration. Useful for testing."""
+    global _cached_config
+    _cached_config = None
+
+
+def _load_config(targets_path: str | None, int_strs: tuple[str | None, ...]) -> Config:
+    """Build a Config from the raw SPEED_BUMP_* values (see load_config).
+
+    Args:
+        targets_path: The value of SPEED_BUMP_TARGETS.
+        int_strs: The values of the _INT_SETTINGS variables, in order.
+    """
     if not targets_path:
         # Speed bump is disabled
         return Config(
@@ -132,12 +198,10 @@ def load_config() -> Config:
         )
 
     # Load targets
-    path = Path(targets_path)
-    if not path.exists():
-        raise ConfigError(f"SPEED_BUMP_TARGETS: file not found: {targets_path}")
-
     try:
-        targets = load_targets(path)
+        targets = load_targets(targets_path)
+    except FileNotFoundError:
+        raise ConfigError(f"SPEED_BUMP_TARGETS: file not found: {targets_path}") from None
     except Exception as e:
         raise ConfigError(f"SPEED_BUMP_TARGETS: {e}") from None
 
@@ -153,13 +217,17 @@ def load_config() -> Config:
         )
 
     # Parse other settings
-    delay_ns = _parse_int("SPEED_BUMP_DELAY_NS", default=1000, min_value=0)
-    frequency = _parse_int("SPEED_BUMP_FREQUENCY", default=1, min_value=1)
-    start_ms = _parse_int("SPEED_BUMP_START_MS", default=0, min_value=0)
-    duration_ms = _parse_int("SPEED_BUMP_DURATION_MS", default=0, min_value=0)
+    delay_ns, frequency, start_ms, duration_ms, sleep_flag = (
+        _parse_int(name, value_str, default, min_value)
+        for (name, default, min_value), value_str in zip(_INT_SETTINGS, int_strs, strict=True)
+    )
+    sleep = sleep_flag != 0
 
-    # Validate delay against minimum
-    min_delay = get_min_delay_ns()
+    # Validate an explicit delay against the minimum. The default is left
+    # alone: a delay below the minimum still takes the minimum to spin, so
+    # clamping it would only change the reported value.
+    delay_str = int_strs[0]
+    min_delay = min_delay_ns if delay_str is not None else 0
     if delay_ns < min_delay:
         _warn(
             f"SPEED_BUMP_DELAY_NS: requested delay {delay_ns} ns < minimum {min_delay} ns\n"
@@ -182,6 +250,7 @@ def load_config() -> Config:
         frequency=frequency,
         start_ns=start_ns,
         end_ns=end_ns,
+        sleep=sleep,
     )
 
     # Report configuration
@@ -204,6 +273,8 @@ def _report_config(config: Config, targets_path: str) -> None:
     print(
         f"speed_bump: delay: {config.delay_ns} ns, frequency: {config.frequency}", file=sys.stderr
     )
+    if config.sleep:
+        print("speed_bump: delay mode: sleep", file=sys.stderr)
 
     if config.start_ns > _PROCESS_START_NS:
         start_offset_ms = (config.start_ns - _PROCESS_START_NS) // 1_000_000
@@ -4,15 +4,30 @@
  * Provides:
  * - Clock calibration for measuring clock_gettime overhead
  * - Spin delay implementation
- * - PEP 669 monitoring integration (future phases)
+ * - Per-code-object match cache for PEP 669 monitoring
+ * - PEP 669 PY_START handler implemented in C
+ *
+ * The match cache and the handler need sys.monitoring and the PyUnstable
+ * co_extra API, both new in Python 3.12, and are only built there. Older
+ * versions use the setprofile backend (_setprofile.c) and get the clock
+ * calibration and spin delay only.
  */
 
 #define PY_SSIZE_T_CLEAN
 #include <Python.h>
 #include <time.h>
+#include <errno.h>
 #include <stdint.h>
 #include <stdio.h>
 #include <stdbool.h>
+#include <stdatomic.h>
+#include <string.h>
+#include <stdlib.h>
+#include <pthread.h>
+
+#if PY_VERSION_HEX >= 0x030C0000
+#define HAVE_SYS_MONITORING 1
+#endif
 
 /* Architecture-specific pause instruction */
 #ifdef __x86_64__
@@ -24,11 +39,30 @@
 #define CPU_PAUSE() ((void)0)
 #endif
 
+/* Architecture-specific cycle counter: the x86 TSC or the ARM virtual
+ * counter. Reading it is several times cheaper than clock_gettime. */
+#if defined(__x86_64__)
+#include <cpuid.h>
+#include <x86intrin.h>
+#define HAVE_CYCLE_COUNTER 1
+static inline uint64_t read_cycle_counter(void) {
+    return __rdtsc();
+}
+#elif defined(__aarch64__)
+#define HAVE_CYCLE_COUNTER 1
+static inline uint64_t read_cycle_counter(void) {
+    uint64_t ticks;
+    __asm__ __volatile__("mrs %0, cntvct_el0" : "=r"(ticks));
+    return ticks;
+}
+#endif
+
 /* ============================================================================
  * Module State
  *
  * Thread-safety notes:
- * - g_clock_overhead_ns and g_calibrated are written once during module init
+ * - g_clock_overhead_ns, g_min_delay_ns and g_calibrated are written once
+ *   during module init
  * - Python's import machinery serialises module init (even on FTP)
  * - After init, these are read-only and safe to access from any thread
  * - spin_delay_ns() uses only local variables and is fully thread-safe
@@ -36,11 +70,152 @@
  * Verified with ThreadSanitizer: spin_delay_ns shows no races when called
  * from 8 concurrent threads. calibrate_clock would race if called
  * concurrently, but this never happens due to import serialisation.
+ *
+ * g_ticks_per_ns is measured lazily, when monitoring is first enabled (see
+ * ensure_cycle_counter), so processes that import speed_bump but never
+ * install it skip the 1ms measurement. It is atomic because a direct
+ * spin_delay_ns() call may read it while another thread calibrates.
  * ============================================================================ */
 
 static uint64_t g_clock_overhead_ns = 0;
+static uint64_t g_min_delay_ns = 0;  /* 2 * g_clock_overhead_ns */
 static bool g_calibrated = false;
 
+/* Cycle counter ticks per nanosecond, or 0 if spins must use the clock */
+static _Atomic double g_ticks_per_ns = 0.0;
+
+#ifdef HAVE_SYS_MONITORING
+
+static pthread_once_t g_cycle_counter_once = PTHREAD_ONCE_INIT;
+
+/* ============================================================================
+ * Match Cache State
+ *
+ * Match results are stored directly on code objects via co_extra, so a
+ * lookup is a single pointer load with no hashing. Only matches are
+ * cached: the handler returns DISABLE for a non-match, after which the VM
+ * stops reporting that code object, so caching non-matches would only cost
+ * a co_extra allocation on every code object seen. Each entry packs a
+ * counter ID, the cache generation and the match state into the pointer
+ * value:
+ *
+ *     entry = (counter_id << CACHE_ID_SHIFT) | (generation << 2) | state
+ *
+ * Bumping g_cache_generation invalidates every entry at once, which is how
+ * clear_match_cache() and set_matcher() drop stale results without walking
+ * all code objects. Entries are plain integers, so no free function is
+ * needed for the co_extra slot.
+ *
+ * Matching code objects get a dense counter ID, assigned from g_next_counter_id
+ * on first sight. The ID indexes the per-thread call counter array used for
+ * frequency throttling (see Call Counters below). IDs restart from zero with
+ * each generation.
+ *
+ * Thread-safety notes:
+ * - On GIL builds the GIL serialises all access
+ * - On FTP builds co_extra access is wrapped in a per-code critical section
+ *   and the matcher reference is guarded by g_matcher_lock
+ * ============================================================================ */
+
+#define MATCH_STATE_MASK  ((uintptr_t)0x3)
+#define MATCH_STATE_MATCH ((uintptr_t)0x2)
+
+/* The upper half of the entry holds the counter ID, the rest the generation */
+#define CACHE_ID_SHIFT    (sizeof(uintptr_t) * 4)
+#define CACHE_GEN_MASK    ((((uintptr_t)1) << (CACHE_ID_SHIFT - 2)) - 1)
+
+/* Code objects past this many share the last counter */
+#define MAX_COUNTER_IDS   ((size_t)1 << 16)
+
+static Py_ssize_t g_extra_index = -1;
+static _Atomic uintptr_t g_cache_generation = 1;
+static _Atomic size_t g_next_counter_id = 0;
+
+/* Callable (module_name, qualified_name) -> bool, or NULL */
+static PyObject *g_matcher = NULL;
+
+/* Critical sections are a no-op before Python 3.13 (always GIL-protected) */
+#ifndef Py_BEGIN_CRITICAL_SECTION
+#define Py_BEGIN_CRITICAL_SECTION(op) {
+#define Py_END_CRITICAL_SECTION() }
+#endif
+
+#ifdef Py_GIL_DISABLED
+static PyMutex g_matcher_lock;
+#define MATCHER_LOCK() PyMutex_Lock(&g_matcher_lock)
+#define MATCHER_UNLOCK() PyMutex_Unlock(&g_matcher_lock)
+#else
+#define MATCHER_LOCK() ((void)0)
+#define MATCHER_UNLOCK() ((void)0)
+#endif
+
+/* ============================================================================
+ * Handler State
+ *
+ * The PY_START handler runs on every call to a monitored function, so it
+ * reads its configuration from C globals rather than from the Python Config
+ * object. install() copies the Config fields here via set_hot_config().
+ *
+ * The window bounds arrive as time.time_ns() values and are converted to
+ * CLOCK_MONOTONIC once, at configuration time, and stored as a start and
+ * a length, so the window check is a single unsigned compare:
+ *
+ *     (uint64_t)(now - start) < length
+ *
+ * A time before the start wraps to a huge value and fails the compare. The
+ * start is clamped to zero (monotonic time is never negative), which keeps
+ * the length below 2^63 so the wrap can't land inside the window.
+ *
+ * The handler reads the clock for this with window_clock_ns(), a coarse
+ * clock. Once the start has passed and there is no end time, the handler
+ * latches HOT_WINDOW_OPEN and stops reading the clock altogether. Once the
+ * end has passed, the handler returns DISABLE, so each matching code
+ * object stops producing events after one more call.
+ *
+ * The fields are atomics so that set_hot_config() can run on one thread
+ * while the handler runs on others (including on FTP builds) without a
+ * lock. The handler uses relaxed loads, which compile to plain loads;
+ * g_hot_enabled is stored last with release ordering and loaded with
+ * acquire ordering, so a handler that sees it set also sees the rest of
+ * the configuration.
+ *
+ * The latched flags live in g_hot_state next to an epoch that every
+ * set_hot_config() bumps:
+ *
+ *     state = (epoch << 2) | HOT_UNCONDITIONAL | HOT_WINDOW_OPEN
+ *
+ * The handler latches with a compare-exchange against the state it loaded,
+ * so a handler still working from an old configuration can't set a flag
+ * after set_hot_config() has installed a new one: the epoch differs and the
+ * exchange fails.
+ * ============================================================================ */
+
+static _Atomic bool g_hot_enabled = false;
+static _Atomic uint64_t g_hot_delay_ns = 0;
+static _Atomic int64_t g_hot_frequency = 1;
+static _Atomic int64_t g_hot_start_mono_ns = 0;
+static _Atomic uint64_t g_hot_window_len_ns = INT64_MAX;
+static _Atomic bool g_hot_open_ended = true;  /* No end time */
+static _Atomic bool g_hot_sleep = false;
+static _Atomic uint64_t g_hot_state = 0;
+
+/* The window has started and has no end */
+#define HOT_WINDOW_OPEN     ((uint64_t)0x1)
+
+/* Every matching call gets a plain spin delay: the window is open for good,
+ * frequency is 1 and sleeping is off. This is the default configuration,
+ * and the handler then skips straight to the spin. */
+#define HOT_UNCONDITIONAL   ((uint64_t)0x2)
+
+#define HOT_EPOCH_SHIFT     2
+
+/* sys.monitoring.DISABLE, fetched by the first set_hot_config() that
+ * enables the handler (see load_monitoring_disable). Guarded by
+ * g_matcher_lock on FTP builds while it is being set. */
+static PyObject *g_monitoring_disable = NULL;
+
+#endif  /* HAVE_SYS_MONITORING */
+
 /* ============================================================================
  * Time Utilities
  * ============================================================================ */
@@ -49,14 +224,76 @@ static inline uint64_t timespec_to_ns(const struct timespec *ts) {
     return (uint64_t)ts->tv_sec * 1000000000ULL + (uint64_t)ts->tv_nsec;
 }
 
+/* Wall-clock time, comparable with Python's time.time_ns() */
+static inline int64_t wall_time_ns(void) {
+    struct timespec ts;
+    clock_gettime(CLOCK_REALTIME, &ts);
+    return (int64_t)timespec_to_ns(&ts);
+}
+
+static inline int64_t monotonic_ns(void) {
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return (int64_t)timespec_to_ns(&ts);
+}
+
+/*
+ * CLOCK_MONOTONIC at the resolution of the kernel tick, for the timing
+ * window check.
+ *
+ * The window bounds are set in milliseconds, so a reading that lags by up
+ * to one tick (1-4ms) moves the edges by no more than the user could
+ * express, and the coarse clock is served from the vDSO without reading
+ * the hardware counter. It shares CLOCK_MONOTONIC's epoch, so it compares
+ * directly with the stored window start.
+ */
+static inline int64_t window_clock_ns(void) {
+#ifdef CLOCK_MONOTONIC_COARSE
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC_COARSE, &ts);
+    return (int64_t)timespec_to_ns(&ts);
+#else
+    return monotonic_ns();
+#endif
+}
+
+#ifdef HAVE_SYS_MONITORING
+
+/* Convert a time.time_ns() timestamp to CLOCK_MONOTONIC, saturating */
+static int64_t wall_to_monotonic_ns(int64_t wall_ns) {
+    int64_t offset = monotonic_ns() - wall_time_ns();
+    if (offset > 0 && wall_ns > INT64_MAX - offset) {
+        return INT64_MAX;
+    }
+    if (offset < 0 && wall_ns < INT64_MIN - offset) {
+        return INT64_MIN;
+    }
+    return wall_ns + offset;
+}
+
+#endif  /* HAVE_SYS_MONITORING */
+
 /* ============================================================================
  * Calibration
  * ============================================================================ */
 
+static int compare_uint64(const void *a, const void *b) {
+    uint64_t x = *(const uint64_t *)a, y = *(const uint64_t *)b;
+    return (x > y) - (x < y);
+}
+
+/*
+ * Measure clock_gettime overhead as the median over batches of reads.
+ *
+ * Each batch gives a mean per read; the median across batches ignores the
+ * batches that an interrupt or preemption landed in, which would skew a
+ * single long mean. Batching keeps each sample well above the clock's
+ * resolution.
+ */
 static void calibrate_clock(void) {
     struct timespec ts, start, end;
-    const int WARMUP = 1000;
-    const int ITERS = 100000;
+    enum { WARMUP = 1000, BATCHES = 101, BATCH_ITERS = 100 };
+    uint64_t batch_ns[BATCHES];
 
     /* Warmup - prime caches and TLB */
     for (int i = 0; i < WARMUP; i++) {
@@ -64,27 +301,96 @@ static void calibrate_clock(void) {
     }
 
     /* Measure */
-    clock_gettime(CLOCK_MONOTONIC, &start);
-    for (int i = 0; i < ITERS; i++) {
-        clock_gettime(CLOCK_MONOTONIC, &ts);
+    for (int b = 0; b < BATCHES; b++) {
+        clock_gettime(CLOCK_MONOTONIC, &start);
+        for (int i = 0; i < BATCH_ITERS; i++) {
+            clock_gettime(CLOCK_MONOTONIC, &ts);
+        }
+        clock_gettime(CLOCK_MONOTONIC, &end);
+        batch_ns[b] = timespec_to_ns(&end) - timespec_to_ns(&start);
     }
-    clock_gettime(CLOCK_MONOTONIC, &end);
 
-    uint64_t elapsed = timespec_to_ns(&end) - timespec_to_ns(&start);
-    g_clock_overhead_ns = elapsed / ITERS;
+    qsort(batch_ns, BATCHES, sizeof(batch_ns[0]), compare_uint64);
+    g_clock_overhead_ns = batch_ns[BATCHES / 2] / BATCH_ITERS;
+    g_min_delay_ns = 2 * g_clock_overhead_ns;
     g_calibrated = true;
 
     fprintf(stderr, "speed_bump: clock_gettime overhead: %lu ns\n",
             (unsigned long)g_clock_overhead_ns);
     fprintf(stderr, "speed_bump: minimum achievable delay: %lu ns\n",
-            (unsigned long)(2 * g_clock_overhead_ns));
+            (unsigned long)g_min_delay_ns);
 }
 
+#ifdef HAVE_SYS_MONITORING
+
+/*
+ * Measure the cycle counter rate so spins can run on it.
+ *
+ * On x86 the TSC is only used if CPUID reports it as invariant (constant
+ * rate, unaffected by frequency scaling or C-states); otherwise spins keep
+ * using CLOCK_MONOTONIC. The ARM counter frequency is read from cntfrq_el0.
+ */
+static void calibrate_cycle_counter(void) {
+#if defined(__x86_64__)
+    unsigned int eax, ebx, ecx, edx;
+    if (!__get_cpuid(0x80000007, &eax, &ebx, &ecx, &edx) || !(edx & (1u << 8))) {
+        return;  /* No invariant TSC */
+    }
+
+    /* Count ticks across ~1ms of CLOCK_MONOTONIC */
+    _mm_lfence();
+    uint64_t start_ns = (uint64_t)monotonic_ns();
+    uint64_t start_ticks = __rdtsc();
+    uint64_t now_ns;
+    do {
+        now_ns = (uint64_t)monotonic_ns();
+    } while (now_ns - start_ns < 1000000);
+    _mm_lfence();
+    uint64_t ticks = __rdtsc() - start_ticks;
+
+    double ticks_per_ns = (double)ticks / (double)(now_ns - start_ns);
+    if (ticks_per_ns > 0.1 && ticks_per_ns < 10.0) {
+        atomic_store_explicit(&g_ticks_per_ns, ticks_per_ns, memory_order_relaxed);
+    }
+#elif defined(__aarch64__)
+    uint64_t freq;
+    __asm__ __volatile__("mrs %0, cntfrq_el0" : "=r"(freq));
+    atomic_store_explicit(&g_ticks_per_ns, (double)freq / 1e9, memory_order_relaxed);
+#endif
+}
+
+/*
+ * Calibrate the cycle counter, once, when monitoring is first enabled.
+ *
+ * Called from set_hot_config(), so the 1ms measurement happens at install
+ * rather than in the first delayed call. Until then spins use the clock
+ * loop, which is equally accurate, just costlier per iteration.
+ */
+static void ensure_cycle_counter(void) {
+    pthread_once(&g_cycle_counter_once, calibrate_cycle_counter);
+}
+
+#endif  /* HAVE_SYS_MONITORING */
+
 /* ============================================================================
  * Spin Delay
+ *
+ * Spins poll the cycle counter against a deadline computed once up front,
+ * falling back to CLOCK_MONOTONIC where no usable counter exists.
  * ============================================================================ */
 
 static void spin_delay_ns(uint64_t delay_ns) {
+#ifdef HAVE_CYCLE_COUNTER
+    double ticks_per_ns = atomic_load_explicit(&g_ticks_per_ns, memory_order_relaxed);
+    if (ticks_per_ns > 0.0) {
+        uint64_t deadline = read_cycle_counter() + (uint64_t)((double)delay_ns * ticks_per_ns);
+        while (read_cycle_counter() < deadline) {
+            CPU_PAUSE();
+        }
+        return;
+    }
+#endif
+
     struct timespec start, now;
 
     clock_gettime(CLOCK_MONOTONIC, &start);
@@ -99,6 +405,339 @@ static void spin_delay_ns(uint64_t delay_ns) {
     }
 }
 
+#ifdef HAVE_SYS_MONITORING
+
+/*
+ * Delay mostly by sleeping, for SPEED_BUMP_SLEEP.
+ *
+ * Long delays sleep until SLEEP_SPIN_TAIL_NS before the deadline and spin
+ * the rest, since wakeups can be late by the timer slack (50us by default
+ * on Linux). Shorter delays are spun in full. The caller still holds the
+ * GIL while sleeping, so GIL builds keep the same serialisation as the spin.
+ */
+#define SLEEP_THRESHOLD_NS 200000
+#define SLEEP_SPIN_TAIL_NS 100000
+
+static void sleep_delay_ns(uint64_t delay_ns) {
+#ifdef TIMER_ABSTIME
+    if (delay_ns > SLEEP_THRESHOLD_NS) {
+        struct timespec start, wake;
+
+        clock_gettime(CLOCK_MONOTONIC, &start);
+        uint64_t end_ns = timespec_to_ns(&start) + delay_ns;
+        uint64_t wake_ns = end_ns - SLEEP_SPIN_TAIL_NS;
+        wake.tv_sec = (time_t)(wake_ns / 1000000000ULL);
+        wake.tv_nsec = (long)(wake_ns % 1000000000ULL);
+
+        while (clock_nanosleep(CLOCK_MONOTONIC, TIMER_ABSTIME, &wake, NULL) == EINTR) {
+        }
+
+        struct timespec now;
+        clock_gettime(CLOCK_MONOTONIC, &now);
+        uint64_t now_ns = timespec_to_ns(&now);
+        if (now_ns >= end_ns) {
+            return;
+        }
+        delay_ns = end_ns - now_ns;
+    }
+#endif
+    spin_delay_ns(delay_ns);
+}
+
+/* ============================================================================
+ * Match Cache
+ * ============================================================================ */
+
+static uintptr_t code_extra_get(PyObject *code) {
+    void *extra = NULL;
+    int rc;
+
+    Py_BEGIN_CRITICAL_SECTION(code);
+    rc = PyUnstable_Code_GetExtra(code, g_extra_index, &extra);
+    Py_END_CRITICAL_SECTION();
+
+    if (rc < 0) {
+        PyErr_Clear();
+        return 0;
+    }
+    return (uintptr_t)extra;
+}
+
+static void code_extra_set(PyObject *code, uintptr_t value) {
+    int rc;
+
+    Py_BEGIN_CRITICAL_SECTION(code);
+    rc = PyUnstable_Code_SetExtra(code, g_extra_index, (void *)value);
+    Py_END_CRITICAL_SECTION();
+
+    if (rc < 0) {
+        PyErr_Clear();  /* Caching is best effort */
+    }
+}
+
+/*
+ * Invalidate all cached match results.
+ *
+ * Counter IDs are reset before the generation moves on, so an ID handed out
+ * after the reset can only be stored under the new generation if it was
+ * allocated after the reset too.
+ */
+static void bump_cache_generation(void) {
+    atomic_store(&g_next_counter_id, 0);
+    atomic_fetch_add(&g_cache_generation, 1);
+}
+
+/*
+ * Check whether a code object matches the installed matcher.
+ * If counter_id is not NULL, it receives the code object's counter ID on a
+ * match.
+ * Returns: 1 = match, 0 = no match, -1 = error (exception set)
+ */
+static int check_match(PyCodeObject *code, size_t *counter_id) {
+    uintptr_t generation = atomic_load_explicit(&g_cache_generation, memory_order_relaxed);
+    uintptr_t entry = code_extra_get((PyObject *)code);
+
+    /* Fast path: cached match from the current generation */
+    if ((entry & MATCH_STATE_MASK) == MATCH_STATE_MATCH
+            && ((entry >> 2) & CACHE_GEN_MASK) == (generation & CACHE_GEN_MASK)) {
+        if (counter_id != NULL) {
+            *counter_id = (size_t)(entry >> CACHE_ID_SHIFT);
+        }
+        return 1;
+    }
+
+    MATCHER_LOCK();
+    PyObject *matcher = Py_XNewRef(g_matcher);
+    MATCHER_UNLOCK();
+
+    if (matcher == NULL) {
+        return 0;
+    }
+
+    /* Match on the filename, which allows globbing on paths */
+    PyObject *result = PyObject_CallFunctionObjArgs(
+        matcher, code->co_filename, code->co_qualname, NULL
+    );
+    Py_DECREF(matcher);
+    if (result == NULL) {
+        return -1;
+    }
+
+    int matches = PyObject_IsTrue(result);
+    Py_DECREF(result);
+    if (matches <= 0) {
+        return matches;
+    }
+
+    size_t id = atomic_fetch_add_explicit(&g_next_counter_id, 1, memory_order_relaxed);
+    if (id >= MAX_COUNTER_IDS) {
+        id = MAX_COUNTER_IDS - 1;
+    }
+    entry = ((uintptr_t)id << CACHE_ID_SHIFT)
+            | ((generation & CACHE_GEN_MASK) << 2) | MATCH_STATE_MATCH;
+    code_extra_set((PyObject *)code, entry);
+    if (counter_id != NULL) {
+        *counter_id = id;
+    }
+    return 1;
+}
+
+/* ============================================================================
+ * Call Counters
+ *
+ * Frequency throttling counts calls per matched code object and per thread.
+ * Each thread owns a flat array of counters indexed by counter ID, so a
+ * throttled call costs one load and one store with no locking and no Python
+ * objects. The array is tagged with the cache generation it was filled
+ * under and is zeroed when the generation changes, since IDs are reused.
+ *
+ * The array is reached through a _Thread_local pointer; a pthread key with
+ * a destructor frees it when the thread exits.
+ * ============================================================================ */
+
+typedef struct {
+    uintptr_t generation;
+    size_t capacity;
+    int64_t counts[];
+} CallCounters;
+
+static _Thread_local CallCounters *t_call_counters = NULL;
+static pthread_key_t g_call_counters_key;
+static pthread_once_t g_call_counters_once = PTHREAD_ONCE_INIT;
+
+static void create_call_counters_key(void) {
+    pthread_key_create(&g_call_counters_key, free);
+}
+
+/*
+ * Grow (or reset) the calling thread's counter array so that id is a valid
+ * index. Returns NULL on allocation failure (exception set).
+ */
+static CallCounters *ensure_call_counters(size_t id, uintptr_t generation) {
+    CallCounters *counters = t_call_counters;
+
+    if (counters != NULL && counters->generation != generation) {
+        memset(counters->counts, 0, counters->capacity * sizeof(int64_t));
+        counters->generation = generation;
+    }
+    if (counters != NULL && id < counters->capacity) {
+        return counters;
+    }
+
+    size_t old_capacity = counters == NULL ? 0 : counters->capacity;
+    size_t capacity = old_capacity == 0 ? 64 : old_capacity;
+    while (capacity <= id) {
+        capacity *= 2;
+    }
+
+    CallCounters *grown = realloc(counters, sizeof(CallCounters) + capacity * sizeof(int64_t));
+    if (grown == NULL) {
+        PyErr_NoMemory();
+        return NULL;
+    }
+    memset(grown->counts + old_capacity, 0, (capacity - old_capacity) * sizeof(int64_t));
+    grown->generation = generation;
+    grown->capacity = capacity;
+
+    pthread_once(&g_call_counters_once, create_call_counters_key);
+    pthread_setspecific(g_call_counters_key, grown);
+    t_call_counters = grown;
+    return grown;
+}
+
+/* ============================================================================
+ * PY_START Handler
+ * ============================================================================ */
+
+/*
+ * Count a call to a matched code object in the calling thread.
+ *
+ * Each counter holds the calls since the last delayed one and is reset
+ * when it reaches frequency, which replaces a modulo with a compare.
+ * Returns 1 if this call should be delayed, 0 if not, or -1 on error
+ * (exception set).
+ */
+static inline int count_call(size_t id, int64_t frequency) {
+    uintptr_t generation = atomic_load_explicit(&g_cache_generation, memory_order_relaxed);
+    CallCounters *counters = t_call_counters;
+
+    if (counters == NULL || counters->generation != generation || id >= counters->capacity) {
+        counters = ensure_call_counters(id, generation);
+        if (counters == NULL) {
+            return -1;
+        }
+    }
+    if (++counters->counts[id] < frequency) {
+        return 0;
+    }
+    counters->counts[id] = 0;
+    return 1;
+}
+
+PyDoc_STRVAR(py_start_handler_doc,
+"py_start_handler(code, instruction_offset)\n"
+"\n"
+"Callback for sys.monitoring PY_START events.\n"
+"\n"
+"Checks the code object against the installed matcher (cached), then\n"
+"applies the configured delay if within the timing window and frequency\n"
+"threshold.\n"
+"\n"
+"Returns:\n"
+"    sys.monitoring.DISABLE for code objects that will never match and\n"
+"    once the timing window has ended, None otherwise.\n"
+);
+
+static PyObject* py_start_handler(PyObject* self, PyObject *const *args, Py_ssize_t nargs) {
+    (void)self;
+
+    if (nargs != 2) {
+        PyErr_SetString(PyExc_TypeError, "py_start_handler() takes exactly 2 arguments");
+        return NULL;
+    }
+    if (!PyCode_Check(args[0])) {
+        PyErr_SetString(PyExc_TypeError, "py_start_handler() requires a code object");
+        return NULL;
+    }
+    PyCodeObject *code = (PyCodeObject *)args[0];
+
+    /* Uninstalled: uninstall() has cleared our local events, so this is a
+     * straggler. Returning DISABLE would leave the location disabled after
+     * the next install, so just skip it. */
+    if (!atomic_load_explicit(&g_hot_enabled, memory_order_acquire)) {
+        Py_RETURN_NONE;
+    }
+
+    /* Disable monitoring for code objects that will never match */
+    size_t counter_id = 0;
+    int matches = check_match(code, &counter_id);
+    if (matches < 0) {
+        return NULL;
+    }
+    if (!matches) {
+        return Py_NewRef(g_monitoring_disable);
+    }
+
+    /* Acquire pairs with the release in set_hot_config(), so the fields
+     * read below are at least as new as this state's epoch */
+    uint64_t state = atomic_load_explicit(&g_hot_state, memory_order_acquire);
+    if (state & HOT_UNCONDITIONAL) {
+        spin_delay_ns(atomic_load_explicit(&g_hot_delay_ns, memory_order_relaxed));
+        Py_RETURN_NONE;
+    }
+
+    if (!(state & HOT_WINDOW_OPEN)) {
+        uint64_t since_start = (uint64_t)window_clock_ns()
+                - (uint64_t)atomic_load_explicit(&g_hot_start_mono_ns, memory_order_relaxed);
+        if (since_start >= atomic_load_explicit(&g_hot_window_len_ns, memory_order_relaxed)) {
+            /* Past the end, the window can't reopen until the next install,
+             * which re-arms our code objects; stop monitoring this one.
+             * Before the start (since_start wrapped past INT64_MAX), skip
+             * the delay but keep monitoring, since we'll enter the window
+             * later. */
+            if (since_start <= INT64_MAX) {
+                return Py_NewRef(g_monitoring_disable);
+            }
+            Py_RETURN_NONE;
+        }
+        if (atomic_load_explicit(&g_hot_open_ended, memory_order_relaxed)) {
+            /* Started with no end: the window can never close again. If
+             * the configuration changed since the load, the exchange fails
+             * and the new configuration's state stands. */
+            uint64_t latched = state | HOT_WINDOW_OPEN;
+            if (atomic_load_explicit(&g_hot_frequency, memory_order_relaxed) == 1
+                    && !atomic_load_explicit(&g_hot_sleep, memory_order_relaxed)) {
+                latched |= HOT_UNCONDITIONAL;
+            }
+            atomic_compare_exchange_strong_explicit(&g_hot_state, &state, latched,
+                                                    memory_order_relaxed,
+                                                    memory_order_relaxed);
+        }
+    }
+
+    /* Handle frequency: only delay every Nth call */
+    int64_t frequency = atomic_load_explicit(&g_hot_frequency, memory_order_relaxed);
+    if (frequency > 1) {
+        int due = count_call(counter_id, frequency);
+        if (due < 0) {
+            return NULL;
+        }
+        if (!due) {
+            Py_RETURN_NONE;
+        }
+    }
+
+    uint64_t delay_ns = atomic_load_explicit(&g_hot_delay_ns, memory_order_relaxed);
+    if (atomic_load_explicit(&g_hot_sleep, memory_order_relaxed)) {
+        sleep_delay_ns(delay_ns);
+    } else {
+        spin_delay_ns(delay_ns);
+    }
+    Py_RETURN_NONE;
+}
+
+#endif  /* HAVE_SYS_MONITORING */
+
 /* ============================================================================
  * Python API
  * ============================================================================ */
@@ -108,8 +747,11 @@ PyDoc_STRVAR(py_spin_delay_ns_doc,
 "\n"
 "Spin-wait for the specified number of nanoseconds.\n"
 "\n"
-"This function does NOT yield the thread; it busy-waits using\n"
-"clock_gettime(CLOCK_MONOTONIC) to measure elapsed time.\n"
+"This function does NOT yield the thread or release the GIL; it\n"
+"busy-waits on the cycle counter once install() has calibrated it, or\n"
+"on clock_gettime(CLOCK_MONOTONIC) until then or where no usable\n"
+"counter exists. Holding the GIL is deliberate: the delay stands in\n"
+"for slower Python code, which would hold it too.\n"
 "\n"
 "Args:\n"
 "    nanoseconds: Number of nanoseconds to delay (uint64).\n"
@@ -145,19 +787,22 @@ static PyObject* py_get_clock_overhead_ns(PyObject* self, PyObject* args) {
 PyDoc_STRVAR(py_get_min_delay_ns_doc,
 "get_min_delay_ns()\n"
 "\n"
-"Get the minimum achievable delay in nanoseconds.\n"
+"Get the minimum delay in nanoseconds.\n"
 "\n"
-"This is 2x the clock_gettime overhead, since spin_delay_ns\n"
-"requires at least two clock reads (start and end).\n"
+"This is 2x the clock_gettime overhead. Spins on the cycle counter\n"
+"(once install() has calibrated it) can be shorter, but the fallback\n"
+"clock_gettime spin needs at least two clock reads (start and end),\n"
+"and the minimum is set by that slower path so a delay behaves the\n"
+"same on either.\n"
 "\n"
 "Returns:\n"
-"    int: The minimum achievable delay.\n"
+"    int: The minimum delay.\n"
 );
 
 static PyObject* py_get_min_delay_ns(PyObject* self, PyObject* args) {
     (void)self;
     (void)args;
-    return PyLong_FromUnsignedLongLong(2 * g_clock_overhead_ns);
+    return PyLong_FromUnsignedLongLong(g_min_delay_ns);
 }
 
 PyDoc_STRVAR(py_is_calibrated_doc,
@@ -175,6 +820,190 @@ static PyObject* py_is_calibrated(PyObject* self, PyObject* args) {
     return PyBool_FromLong(g_calibrated);
 }
 
+#ifdef HAVE_SYS_MONITORING
+
+PyDoc_STRVAR(py_set_matcher_doc,
+"set_matcher(matcher)\n"
+"\n"
+"Install the callable used to classify code objects.\n"
+"\n"
+"The matcher is called as matcher(co_filename, co_qualname) on the first\n"
+"check of each code object and must return a truthy value for targets.\n"
+"Installing a matcher invalidates all cached match results.\n"
+"\n"
+"Args:\n"
+"    matcher: A callable, or None to clear the matcher.\n"
+);
+
+static PyObject* py_set_matcher(PyObject* self, PyObject* matcher) {
+    (void)self;
+
+    if (matcher != Py_None && !PyCallable_Check(matcher)) {
+        PyErr_SetString(PyExc_TypeError, "matcher must be callable or None");
+        return NULL;
+    }
+
+    PyObject *new_matcher = matcher == Py_None ? NULL : Py_NewRef(matcher);
+
+    MATCHER_LOCK();
+    PyObject *old_matcher = g_matcher;
+    g_matcher = new_matcher;
+    MATCHER_UNLOCK();
+
+    bump_cache_generation();
+    Py_XDECREF(old_matcher);
+    Py_RETURN_NONE;
+}
+
+PyDoc_STRVAR(py_check_match_doc,
+"check_match(code)\n"
+"\n"
+"Check whether a code object matches the installed matcher.\n"
+"\n"
+"A match is cached on the code object (co_extra), so the matcher runs\n"
+"once per matching code object until the cache is cleared. Non-matches\n"
+"are not cached.\n"
+"\n"
+"Args:\n"
+"    code: The code object to check.\n"
+"\n"
+"Returns:\n"
+"    bool: True if the code object is a target.\n"
+);
+
+static PyObject* py_check_match(PyObject* self, PyObject* code) {
+    (void)self;
+
+    if (!PyCode_Check(code)) {
+        PyErr_SetString(PyExc_TypeError, "check_match() requires a code object");
+        return NULL;
+    }
+
+    int matches = check_match((PyCodeObject *)code, NULL);
+    if (matches < 0) {
+        return NULL;
+    }
+    return PyBool_FromLong(matches);
+}
+
+PyDoc_STRVAR(py_clear_match_cache_doc,
+"clear_match_cache()\n"
+"\n"
+"Invalidate all cached match results.\n"
+);
+
+static PyObject* py_clear_match_cache(PyObject* self, PyObject* args) {
+    (void)self;
+    (void)args;
+    bump_cache_generation();
+    Py_RETURN_NONE;
+}
+
+PyDoc_STRVAR(py_set_hot_config_doc,
+"set_hot_config(enabled, delay_ns, frequency, start_ns, end_ns, sleep=False)\n"
+"\n"
+"Set the configuration read by py_start_handler.\n"
+"\n"
+"Args:\n"
+"    enabled: Whether the handler applies delays at all.\n"
+"    delay_ns: Delay in nanoseconds per trigger.\n"
+"    frequency: Trigger every Nth matching call.\n"
+"    start_ns: Absolute time (time.time_ns) when slowdown starts.\n"
+"    end_ns: Absolute time (time.time_ns) when slowdown ends, or None.\n"
+"    sleep: Sleep through the bulk of long delays instead of spinning.\n"
+);
+
+/*
+ * Look up sys.monitoring.DISABLE for the handler, once.
+ *
+ * This runs when the handler is first enabled rather than at module init,
+ * so importing _core never depends on sys.monitoring.
+ * Returns 0 on success, -1 on error (exception set).
+ */
+static int load_monitoring_disable(void) {
+    int rc = 0;
+
+    MATCHER_LOCK();
+    if (g_monitoring_disable == NULL) {
+        PyObject *monitoring = PySys_GetObject("monitoring");  /* Borrowed */
+        if (monitoring == NULL) {
+            PyErr_SetString(PyExc_RuntimeError, "sys.monitoring is not available");
+            rc = -1;
+        } else {
+            g_monitoring_disable = PyObject_GetAttrString(monitoring, "DISABLE");
+            rc = g_monitoring_disable == NULL ? -1 : 0;
+        }
+    }
+    MATCHER_UNLOCK();
+    return rc;
+}
+
+static PyObject* py_set_hot_config(PyObject* self, PyObject* args) {
+    (void)self;
+    int enabled;
+    unsigned long long delay_ns;
+    long long frequency;
+    long long start_ns;
+    PyObject *end_obj;
+    int sleep = 0;
+
+    if (!PyArg_ParseTuple(args, "pKLLO|p", &enabled, &delay_ns, &frequency, &start_ns, &end_obj,
+                          &sleep)) {
+        return NULL;
+    }
+    if (frequency < 1) {
+        PyErr_SetString(PyExc_ValueError, "frequency must be at least 1");
+        return NULL;
+    }
+    if (enabled) {
+        if (load_monitoring_disable() < 0) {
+            return NULL;
+        }
+        ensure_cycle_counter();
+    }
+
+    int64_t end_mono_ns = INT64_MAX;
+    if (end_obj != Py_None) {
+        long long end_ns = PyLong_AsLongLong(end_obj);
+        if (end_ns == -1 && PyErr_Occurred()) {
+            return NULL;
+        }
+        end_mono_ns = wall_to_monotonic_ns(end_ns);
+    }
+    int64_t start_mono_ns = wall_to_monotonic_ns(start_ns);
+    if (start_mono_ns < 0) {
+        start_mono_ns = 0;
+    }
+    uint64_t window_len_ns = end_mono_ns > start_mono_ns
+        ? (uint64_t)end_mono_ns - (uint64_t)start_mono_ns : 0;
+
+    /* Disable first so no handler runs with a half-written configuration */
+    atomic_store_explicit(&g_hot_enabled, false, memory_order_relaxed);
+    atomic_store_explicit(&g_hot_delay_ns, (uint64_t)delay_ns, memory_order_relaxed);
+    atomic_store_explicit(&g_hot_frequency, (int64_t)frequency, memory_order_relaxed);
+    atomic_store_explicit(&g_hot_start_mono_ns, start_mono_ns, memory_order_relaxed);
+    atomic_store_explicit(&g_hot_window_len_ns, window_len_ns, memory_order_relaxed);
+    atomic_store_explicit(&g_hot_open_ended, end_mono_ns == INT64_MAX, memory_order_relaxed);
+    atomic_store_explicit(&g_hot_sleep, (bool)sleep, memory_order_relaxed);
+
+    /* A new epoch fails any latch a handler is about to make for the old
+     * configuration */
+    uint64_t epoch = (atomic_load_explicit(&g_hot_state, memory_order_relaxed)
+                      >> HOT_EPOCH_SHIFT) + 1;
+    uint64_t state = epoch << HOT_EPOCH_SHIFT;
+    if (end_mono_ns == INT64_MAX && monotonic_ns() >= start_mono_ns) {
+        state |= HOT_WINDOW_OPEN;
+        if (frequency == 1 && !sleep) {
+            state |= HOT_UNCONDITIONAL;
+        }
+    }
+    atomic_store_explicit(&g_hot_state, state, memory_order_release);
+    atomic_store_explicit(&g_hot_enabled, (bool)enabled, memory_order_release);
+    Py_RETURN_NONE;
+}
+
+#endif  /* HAVE_SYS_MONITORING */
+
 /* ============================================================================
  * Module Definition
  * ============================================================================ */
@@ -185,6 +1014,14 @@ static PyMethodDef module_methods[] = {
      py_get_clock_overhead_ns_doc},
     {"get_min_delay_ns", py_get_min_delay_ns, METH_NOARGS, py_get_min_delay_ns_doc},
     {"is_calibrated", py_is_calibrated, METH_NOARGS, py_is_calibrated_doc},
+#ifdef HAVE_SYS_MONITORING
+    {"set_matcher", py_set_matcher, METH_O, py_set_matcher_doc},
+    {"check_match", py_check_match, METH_O, py_check_match_doc},
+    {"clear_match_cache", py_clear_match_cache, METH_NOARGS, py_clear_match_cache_doc},
+    {"set_hot_config", py_set_hot_config, METH_VARARGS, py_set_hot_config_doc},
+    {"py_start_handler", (PyCFunction)(void(*)(void))py_start_handler, METH_FASTCALL,
+     py_start_handler_doc},
+#endif
     {NULL, NULL, 0, NULL}
 };
 
@@ -194,18 +1031,52 @@ PyDoc_STRVAR(module_doc,
 "Provides low-level primitives for selective Python slowdown:\n"
 "- Clock calibration\n"
 "- Spin delay implementation\n"
-"- PEP 669 monitoring hooks (future)\n"
+"- Per-code-object match cache for PEP 669 monitoring\n"
+"- PEP 669 PY_START handler\n"
 "\n"
 "Thread Safety:\n"
 "- spin_delay_ns() is thread-safe and can run without the GIL\n"
-"- Calibration is performed once at module load time\n"
+"- The clock_gettime overhead is calibrated once at module load time\n"
+"- The cycle counter is calibrated once, by the first set_hot_config()\n"
+"  that enables monitoring; until then spin_delay_ns() polls\n"
+"  clock_gettime\n"
 );
 
+static int add_uint64_constant(PyObject *module, const char *name, uint64_t value) {
+    PyObject *obj = PyLong_FromUnsignedLongLong(value);
+    if (obj == NULL) {
+        return -1;
+    }
+    int rc = PyModule_AddObjectRef(module, name, obj);
+    Py_DECREF(obj);
+    return rc;
+}
+
 /* Multi-phase initialization for Python 3.12+ and FTP support */
 static int module_exec(PyObject *module) {
-    /* Run calibration at module initialization */
+    /* Run calibration at module initialization. The cycle counter is
+     * calibrated later, on first use (see ensure_cycle_counter). */
     calibrate_clock();
 
+#ifdef HAVE_SYS_MONITORING
+    /* Reserve a co_extra slot for the match cache (once per process) */
+    if (g_extra_index < 0) {
+        g_extra_index = PyUnstable_Eval_RequestCodeExtraIndex(NULL);
+        if (g_extra_index < 0) {
+            PyErr_SetString(PyExc_RuntimeError, "Failed to get code extra index");
+            return -1;
+        }
+    }
+#endif
+
+    /* Calibration results never change, so also expose them as constants */
+    if (add_uint64_constant(module, "clock_overhead_ns", g_clock_overhead_ns) < 0) {
+        return -1;
+    }
+    if (add_uint64_constant(module, "min_delay_ns", g_min_delay_ns) < 0) {
+        return -1;
+    }
+
     /* Add version constant */
     if (PyModule_AddStringConstant(module, "__version__", "0.1.0") < 0) {
         return -1;
@@ -220,6 +1091,7 @@ static PyModuleDef_Slot module_slots[] = {
     /* Python 3.13+: Declare this module is safe without the GIL.
      * The spin_delay_ns function uses only local variables and is thread-safe.
      * The global calibration state is written once at init time and read-only thereafter.
+     * The match cache uses per-code critical sections and a matcher lock (see above).
      */
     {Py_mod_gil, Py_MOD_GIL_NOT_USED},
 #endif
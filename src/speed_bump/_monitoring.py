@@ -4,6 +4,13 @@ This module provides function call monitoring with delays for matching targets.
 It automatically selects the appropriate backend based on Python version:
 - Python 3.12+: Uses PEP 669 (sys.monitoring)
 - Python 3.10-3.11: Uses sys.setprofile via C extension
+
+The PEP 669 backend enables PY_START events per code object, only for code
+that matches a target. Code objects that exist at install time are found by
+walking functions and running frames; modules imported later are seen when
+importlib's source and bytecode file loaders hand over their code. Code
+created after install by other means, such as exec() of a source string, a
+zipimport or custom loader, or PyEval_EvalCode from C, is not monitored.
 """
 
 from __future__ import annotations
@@ -15,7 +22,7 @@ from typing import TYPE_CHECKING
 from speed_bump._config import Config
 
 if TYPE_CHECKING:
-    from types import CodeType
+    from collections.abc import Callable, Iterable, Iterator
 
 # Version detection: PEP 669 requires Python 3.12+
 _USE_PEP669 = sys.version_info >= (3, 12)
@@ -34,115 +41,165 @@ _config: Config | None = None
 # ============================================================================
 
 if _USE_PEP669:
-    import time
-
-    from speed_bump._core import spin_delay_ns
-    from speed_bump._patterns import matches_any
+    import gc
+    import weakref
+    from importlib.machinery import SourceFileLoader, SourcelessFileLoader
+    from types import CodeType, FunctionType
+
+    from speed_bump._core import (
+        check_match,
+        clear_match_cache,
+        py_start_handler,
+        set_hot_config,
+        set_matcher,
+    )
+    from speed_bump._patterns import PatternSet
 
     # Tool ID for speed_bump monitoring (use 3 as a mid-range ID)
     TOOL_ID = 3
 
-    # Cache for code object match results: code_id -> (matches, qualified_name)
-    # Using id() as key since code objects are long-lived
-    _match_cache: dict[int, bool] = {}
-    _cache_lock = threading.Lock()
-
-    # Thread-local storage for call counters
-    # Key is code object id, value is call count
-    _call_counters: threading.local = threading.local()
-
     # PEP 669 enabled flag
     _pep669_enabled: bool = False
 
-    def _get_counter_dict() -> dict[int, int]:
-        """Get the thread-local counter dictionary."""
-        if not hasattr(_call_counters, "counters"):
-            _call_counters.counters = {}
-        return _call_counters.counters
-
-    def _get_code_qualified_name(code: CodeType) -> str:
-        """Extract the qualified name from a code object.
-
-        Returns the qualname from the code object. For methods, this includes
-        the class name (e.g., "MyClass.method"). For nested functions, this
-        includes the outer function names.
-        """
-        return code.co_qualname
-
-    def _check_match(code: CodeType, config: Config) -> bool:
-        """Check if a code object matches any target pattern.
-
-        Results are cached per code object to avoid repeated matching.
-        """
-        code_id = id(code)
-
-        # Fast path: check cache without lock
-        if code_id in _match_cache:
-            return _match_cache[code_id]
-
-        # Slow path: compute match and cache
-        with _cache_lock:
-            # Double-check after acquiring lock
-            if code_id in _match_cache:
-                return _match_cache[code_id]
+    # Whether TOOL_ID is claimed and the PY_START callback registered
+    _registered: bool = False
 
-            # Get module and qualified name
-            module = code.co_filename
-            # Try to extract module name from code object
-            # co_filename is the file path, but we want the module name
-            # For matching, we use the filename (allows glob on paths)
-            qualified_name = _get_code_qualified_name(code)
+    # Code objects with PY_START enabled locally, so uninstall can undo it
+    _monitored_code: weakref.WeakSet[CodeType] = weakref.WeakSet()
 
-            result = matches_any(config.targets, module, qualified_name)
-            _match_cache[code_id] = result
-            return result
+    # Loader classes whose get_code is wrapped while installed, mapped to the
+    # get_code they defined themselves (None if inherited), for uninstall
+    _wrapped_loaders: dict[type, Callable[..., CodeType | None] | None] = {}
 
-    def _call_handler(code: CodeType, instruction_offset: int) -> object:
-        """Callback for PY_START events (function call start).
+    # Serialises install() and uninstall(), which update several pieces of
+    # global state (tool registration, C configuration, local events)
+    _install_lock = threading.Lock()
 
-        This is invoked by sys.monitoring when a function call begins.
-        We check if the code object matches our patterns and apply delay
-        if within the timing window and frequency threshold.
-
-        Args:
-            code: The code object of the function being called.
-            instruction_offset: Byte offset of the instruction (unused).
+    def _make_matcher(config: Config) -> Callable[[str, str], bool]:
+        """Build the matcher passed to the C match cache.
 
-        Returns:
-            sys.monitoring.DISABLE to disable monitoring for this code object
-            if it doesn't match our patterns. None otherwise.
+        The C side calls it with (co_filename, co_qualname) the first time
+        it sees a code object; matching on the filename allows globs on paths.
         """
-        global _config
-
-        if _config is None or not _config.enabled:
-            return sys.monitoring.DISABLE
+        return PatternSet(config.targets).matches
 
-        # Check if code object matches patterns (cached)
-        if not _check_match(code, _config):
-            # Disable monitoring for this code object - it will never match
-            return sys.monitoring.DISABLE
+    def _monitor_code_trees(roots: Iterable[CodeType]) -> None:
+        """Enable PY_START for matching code objects in code object trees.
 
-        # Check timing window
-        now_ns = time.time_ns()
-        if not _config.is_in_window(now_ns):
-            # Outside timing window, skip delay but don't disable
-            # (we might enter the window later)
-            return None
+        Nested functions, lambdas and class bodies are code objects stored in
+        co_consts, so walking the tree from a module body covers everything
+        defined in that module.
+        """
+        # install() walks every function in the process through here, so
+        # the lookups are hoisted out of the loop
+        set_local_events = sys.monitoring.set_local_events
+        py_start = sys.monitoring.events.PY_START
+        monitored_add = _monitored_code.add
+        code_type = CodeType
+
+        stack = list(roots)
+        while stack:
+            co = stack.pop()
+            if check_match(co):
+                set_local_events(TOOL_ID, co, py_start)
+                monitored_add(co)
+            stack.extend(c for c in co.co_consts if isinstance(c, code_type))
+
+    def _clear_monitored_code() -> None:
+        """Disable PY_START on every code object enabled by an earlier install.
+
+        Clearing a code object's local events also drops any DISABLE the
+        handler returned for it, so enabling it again re-arms it. This is
+        done per code object rather than with sys.monitoring.restart_events(),
+        which would re-arm every other tool's disabled locations too.
+        """
+        set_local_events = sys.monitoring.set_local_events
+        for code in list(_monitored_code):
+            set_local_events(TOOL_ID, code, 0)
+        _monitored_code.clear()
+
+    def _monitor_code_tree(code: CodeType) -> None:
+        """Enable PY_START for matching code objects in one code object tree."""
+        _monitor_code_trees((code,))
+
+    def _wrap_get_code(
+        get_code: Callable[..., CodeType | None],
+    ) -> Callable[..., CodeType | None]:
+        """Wrap a loader's get_code to monitor the module code it returns."""
+
+        def get_code_and_monitor(self: object, fullname: str) -> CodeType | None:
+            code = get_code(self, fullname)
+            if code is not None:
+                try:
+                    _monitor_code_tree(code)
+                except Exception as e:
+                    # Never fail the user's import because of monitoring
+                    print(f"speed_bump: ERROR: Failed to monitor {fullname}: {e}", file=sys.stderr)
+            return code
+
+        return get_code_and_monitor
+
+    def _wrap_loaders() -> None:
+        """Monitor modules imported from now on.
+
+        PEP 669 has no "code object created" event, so the get_code of
+        importlib's file loaders is wrapped instead. Unlike an audit hook,
+        which can never be removed, this costs nothing outside imports and
+        is undone by _unwrap_loaders().
+        """
+        for loader in (SourceFileLoader, SourcelessFileLoader):
+            if loader in _wrapped_loaders:
+                continue
+            _wrapped_loaders[loader] = loader.__dict__.get("get_code")
+            loader.get_code = _wrap_get_code(loader.get_code)
+
+    def _unwrap_loaders() -> None:
+        """Restore the loader methods replaced by _wrap_loaders()."""
+        for loader, get_code in _wrapped_loaders.items():
+            if get_code is None:
+                del loader.get_code
+            else:
+                loader.get_code = get_code
+        _wrapped_loaders.clear()
+
+    def _existing_code_objects() -> Iterator[CodeType]:
+        """Yield root code objects that already exist in the process.
+
+        Code objects are not tracked by the GC, so they are reached through
+        the functions that reference them and through running frames (which
+        cover module bodies still executing, such as __main__).
+        """
+        for obj in gc.get_objects():
+            if isinstance(obj, FunctionType):
+                yield obj.__code__
+        for frame in sys._current_frames().values():
+            while frame is not None:
+                yield frame.f_code
+                frame = frame.f_back
+
+    def _ensure_registered() -> None:
+        """Claim TOOL_ID and register the PY_START callback, once per process.
+
+        The registration is kept across uninstall(), so an install/uninstall
+        cycle only swaps the configuration and the local events.
+        """
+        global _registered
 
-        # Handle frequency: only delay every Nth call
-        if _config.frequency > 1:
-            counters = _get_counter_dict()
-            code_id = id(code)
-            count = counters.get(code_id, 0) + 1
-            counters[code_id] = count
+        if _registered:
+            return
 
-            if count % _config.frequency != 0:
-                # Not the Nth call, skip delay
-                return None
+        # Register our tool
+        sys.monitoring.use_tool_id(TOOL_ID, "speed_bump")
 
-        # Apply delay
-        spin_delay_ns(_config.delay_ns)
-        return None
+        # Register callback for PY_START events (function call start).
+        # The handler is implemented in C so no Python frame is pushed
+        # per monitored call.
+        sys.monitoring.register_callback(
+            TOOL_ID,
+            sys.monitoring.events.PY_START,
+            py_start_handler,
+        )
+        _registered = True
 
     def install(config: Config) -> bool:
         """Install speed_bump monitoring with the given configuration.
@@ -161,55 +218,60 @@ if _USE_PEP669:
         if not config.targets:
             return False
 
-        _config = config
-
-        try:
-            # Register our tool
-            sys.monitoring.use_tool_id(TOOL_ID, "speed_bump")
-
-            # Register callback for PY_START events (function call start)
-            sys.monitoring.register_callback(
-                TOOL_ID,
-                sys.monitoring.events.PY_START,
-                _call_handler,
+        with _install_lock:
+            set_matcher(_make_matcher(config))
+            set_hot_config(
+                config.enabled,
+                config.delay_ns,
+                config.frequency,
+                config.start_ns,
+                config.end_ns,
+                config.sleep,
             )
+            _config = config
 
-            # Enable PY_START events globally
-            sys.monitoring.set_events(TOOL_ID, sys.monitoring.events.PY_START)
+            try:
+                _ensure_registered()
 
-            _pep669_enabled = True
-            return True
+                # Start from a clean slate, so code objects the handler
+                # disabled under the previous configuration are re-armed
+                _clear_monitored_code()
 
-        except Exception as e:
-            print(f"speed_bump: ERROR: Failed to install monitoring: {e}", file=sys.stderr)
-            return False
+                # Enable PY_START only on matching code objects rather than
+                # globally, so non-matching code is never instrumented.
+                # Modules imported later are picked up by the loaders.
+                _wrap_loaders()
+                _monitor_code_trees(_existing_code_objects())
+
+                _pep669_enabled = True
+                return True
+
+            except Exception as e:
+                print(f"speed_bump: ERROR: Failed to install monitoring: {e}", file=sys.stderr)
+                return False
 
     def uninstall() -> None:
         """Uninstall speed_bump monitoring."""
         global _config, _pep669_enabled
 
-        if not _pep669_enabled:
-            return
+        with _install_lock:
+            if not _pep669_enabled:
+                return
 
-        try:
-            # Disable events
-            sys.monitoring.set_events(TOOL_ID, 0)
-
-            # Unregister callback
-            sys.monitoring.register_callback(
-                TOOL_ID,
-                sys.monitoring.events.PY_START,
-                None,
-            )
+            _unwrap_loaders()
 
-            # Free tool ID
-            sys.monitoring.free_tool_id(TOOL_ID)
+            # Disable the handler first; the callback itself stays registered
+            # (see _ensure_registered)
+            set_hot_config(False, 0, 1, 0, None)
+            set_matcher(None)
 
-        except Exception:
-            pass  # Best effort cleanup
+            try:
+                _clear_monitored_code()
+            except Exception:
+                pass  # Best effort cleanup
 
-        _pep669_enabled = False
-        _config = None
+            _pep669_enabled = False
+            _config = None
 
     def is_installed() -> bool:
         """Check if speed_bump monitoring is installed."""
@@ -217,9 +279,7 @@ if _USE_PEP669:
 
     def clear_cache() -> None:
         """Clear the match cache. Useful for testing."""
-        global _match_cache
-        with _cache_lock:
-            _match_cache.clear()
+        clear_match_cache()
 
 
 # ============================================================================
@@ -227,6 +287,8 @@ if _USE_PEP669:
 # ============================================================================
 
 else:
+    from speed_bump._patterns import PatternSet
+
     # Import the C extension for setprofile-based monitoring
     from speed_bump._setprofile import (
         install_setprofile,
@@ -253,9 +315,17 @@ else:
 
         _config = config
 
+        if config.sleep:
+            print(
+                "speed_bump: WARNING: SPEED_BUMP_SLEEP requires Python 3.12+, spinning instead",
+                file=sys.stderr,
+            )
+
         # Convert Config to dict for C extension
+        # The matcher runs on every match cache miss, so the patterns are
+        # partitioned into a PatternSet once, here
         config_dict = {
-            'targets': list(config.targets),
+            'matcher': PatternSet(config.targets).matches,
             'delay_ns': config.delay_ns,
             'frequency': config.frequency,
             'start_ns': config.start_ns,
@@ -19,9 +19,45 @@ Examples:
 from __future__ import annotations
 
 import fnmatch
+import functools
 import os
-from dataclasses import dataclass
-from pathlib import Path
+import re
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass, field
+
+
+def _glob_to_regex(glob: str) -> str:
+    """Translate a glob to a regex fragment without the end anchor."""
+    return fnmatch.translate(glob).removesuffix(r"\Z")
+
+
+def _has_magic(glob: str) -> bool:
+    """Check if a glob contains any wildcard characters."""
+    return "*" in glob or "?" in glob or "[" in glob
+
+
+def _match_all(_: str) -> bool:
+    return True
+
+
+def _compile_glob(glob: str) -> Callable[[str], object]:
+    """Build a full-match predicate for a glob, specialised on its shape.
+
+    Most globs are literal, "*", "prefix*" or "*suffix", which reduce to a
+    single string compare. Anything else falls back to a compiled regex.
+    The predicate returns a truthy value on a match.
+    """
+    if not _has_magic(glob):
+        return glob.__eq__
+    if glob == "*":
+        return _match_all
+
+    head, tail = glob[:-1], glob[1:]
+    if glob.endswith("*") and not _has_magic(head):
+        return lambda s: s.startswith(head)
+    if glob.startswith("*") and not _has_magic(tail):
+        return lambda s: s.endswith(tail)
+    return re.compile(_glob_to_regex(glob)).fullmatch
 
 
 @dataclass(frozen=True, slots=True)
@@ -31,6 +67,13 @@ class TargetPattern:
     module_pattern: str
     name_pattern: str
     original: str
+    _mod_match: Callable[[str], object] = field(init=False, repr=False, compare=False)
+    _name_match: Callable[[str], object] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Globs are compiled once here rather than on every match
+        object.__setattr__(self, "_mod_match", _compile_glob(self.module_pattern))
+        object.__setattr__(self, "_name_match", _compile_glob(self.name_pattern))
 
     def matches(self, module_name: str, qualified_name: str) -> bool:
         """Check if this pattern matches the given code object.
@@ -42,9 +85,7 @@ class TargetPattern:
         Returns:
             True if both module and name patterns match.
         """
-        return fnmatch.fnmatch(module_name, self.module_pattern) and fnmatch.fnmatch(
-            qualified_name, self.name_pattern
-        )
+        return bool(self._mod_match(module_name) and self._name_match(qualified_name))
 
 
 class PatternError(Exception):
@@ -86,6 +127,29 @@ def parse_pattern(line: str, line_number: int) -> TargetPattern:
     )
 
 
+def _read_file(path: str | os.PathLike[str]) -> bytes:
+    """Read a whole file with raw os calls.
+
+    This skips the buffered file object that open() builds, which is most
+    of the cost of reading a small file.
+    """
+    fd = os.open(path, os.O_RDONLY | os.O_CLOEXEC)
+    try:
+        size = os.fstat(fd).st_size
+        data = os.read(fd, size) if size else b""
+        # Pick up short reads and anything appended since the fstat
+        while chunk := os.read(fd, 65536):
+            data += chunk
+    finally:
+        os.close(fd)
+    return data
+
+
+# A line that is neither blank nor a comment; group 1 starts at its first
+# non-whitespace character
+_PATTERN_LINE_RE = re.compile(rb"^[^\S\n]*([^\s#][^\n]*)", re.MULTILINE)
+
+
 def load_targets(path: str | os.PathLike[str]) -> list[TargetPattern]:
     """Load target patterns from a file.
 
@@ -97,28 +161,119 @@ def load_targets(path: str | os.PathLike[str]) -> list[TargetPattern]:
 
     Raises:
         FileNotFoundError: If the file doesn't exist.
+        UnicodeDecodeError: If a pattern line is not valid UTF-8.
         PatternError: If any pattern is invalid.
     """
-    path = Path(path)
+    # Read in one go and scan as bytes, decoding only the pattern lines
+    data = _read_file(path)
+    if b"\r" in data:
+        data = data.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+
     patterns: list[TargetPattern] = []
+    line_number = 1
+    pos = 0
 
-    with path.open() as f:
-        for line_number, line in enumerate(f, start=1):
-            # Strip whitespace
-            line = line.strip()
+    # The regex skips empty lines and comments, so only pattern lines
+    # reach Python code
+    for m in _PATTERN_LINE_RE.finditer(data):
+        start = m.start()
+        line_number += data.count(b"\n", pos, start)
+        pos = start
+        patterns.append(parse_pattern(m.group(1).rstrip().decode("utf-8"), line_number))
 
-            # Skip empty lines and comments
-            if not line or line.startswith("#"):
-                continue
+    return patterns
 
-            patterns.append(parse_pattern(line, line_number))
 
-    return patterns
+def _compile_names(globs: Sequence[str]) -> Callable[[str], object]:
+    """Build a full-match predicate for any of several name globs."""
+    if len(globs) == 1:
+        return _compile_glob(globs[0])
+    return re.compile("|".join(f"(?:{_glob_to_regex(g)})" for g in globs)).fullmatch
+
 
+class PatternSet:
+    """A set of target patterns partitioned by shape for fast matching.
 
-def matches_any(patterns: list[TargetPattern], module_name: str, qualified_name: str) -> bool:
+    Most target files are dominated by patterns with a literal module, so
+    patterns are split into:
+    - exact patterns (no wildcards): a set lookup on (module, name)
+    - literal-module patterns: a dict lookup on module, then the name
+      pattern's specialised predicate, or one fused regex if the module has
+      several name patterns
+    - wildcard-module patterns: grouped by module glob, so each distinct
+      glob is tested once however many name patterns share it. The globs
+      are resolved once per distinct module name, and the result (a
+      predicate over the name patterns whose module glob matched) is
+      memoised
+
+    All code objects of a module share its name, so the wildcard module
+    globs are checked once per module rather than once per code object.
+    """
+
+    __slots__ = ("_by_module", "_exact", "_wild", "_wild_by_module")
+
+    def __init__(self, patterns: Iterable[TargetPattern]) -> None:
+        exact: set[tuple[str, str]] = set()
+        by_module: dict[str, list[str]] = {}
+        wild: dict[str, list[str]] = {}
+
+        for p in patterns:
+            if _has_magic(p.module_pattern):
+                wild.setdefault(p.module_pattern, []).append(p.name_pattern)
+            elif _has_magic(p.name_pattern):
+                by_module.setdefault(p.module_pattern, []).append(p.name_pattern)
+            else:
+                exact.add((p.module_pattern, p.name_pattern))
+
+        self._exact = frozenset(exact)
+        self._by_module = {module: _compile_names(names) for module, names in by_module.items()}
+        self._wild = tuple((_compile_glob(glob), names) for glob, names in wild.items())
+        self._wild_by_module: dict[str, Callable[[str], object] | None] = {}
+
+    def matches(self, module_name: str, qualified_name: str) -> bool:
+        """Check if any pattern in the set matches the given code object.
+
+        Args:
+            module_name: The __module__ of the code object.
+            qualified_name: The __qualname__ of the code object.
+
+        Returns:
+            True if any pattern matches.
+        """
+        if (module_name, qualified_name) in self._exact:
+            return True
+
+        name_match = self._by_module.get(module_name)
+        if name_match is not None and name_match(qualified_name):
+            return True
+
+        if not self._wild:
+            return False
+
+        try:
+            name_match = self._wild_by_module[module_name]
+        except KeyError:
+            names = [
+                name for mod_match, group in self._wild if mod_match(module_name) for name in group
+            ]
+            name_match = _compile_names(names) if names else None
+            self._wild_by_module[module_name] = name_match
+
+        return name_match is not None and bool(name_match(qualified_name))
+
+
+@functools.lru_cache(maxsize=8)
+def _pattern_set_cached(patterns: tuple[TargetPattern, ...]) -> PatternSet:
+    return PatternSet(patterns)
+
+
+def matches_any(patterns: Sequence[TargetPattern], module_name: str, qualified_name: str) -> bool:
     """Check if any pattern matches the given code object.
 
+    This looks up (or builds) a PatternSet for the patterns on every call,
+    which costs a pass over them; to match many names against the same
+    patterns, build a PatternSet once and call its matches method.
+
     Args:
         patterns: List of patterns to check.
         module_name: The __module__ of the code object.
@@ -127,4 +282,6 @@ def matches_any(patterns: list[TargetPattern], module_name: str, qualified_name:
     Returns:
         True if any pattern matches.
     """
-    return any(p.matches(module_name, qualified_name) for p in patterns)
+    if not patterns:
+        return False
+    return _pattern_set_cached(tuple(patterns)).matches(module_name, qualified_name)
@@ -33,10 +33,8 @@
 /* Index for storing match cache in code object's co_extra */
 static Py_ssize_t g_extra_index = -1;
 
-/* Cached references to Python objects */
-static PyObject *g_patterns_module = NULL;
-static PyObject *g_matches_any_func = NULL;
-static PyObject *g_target_patterns = NULL;  /* List of TargetPattern objects */
+/* Callable (module_name, qualified_name) -> bool, built once per install */
+static PyObject *g_matcher = NULL;
 
 /* Configuration */
 static uint64_t g_delay_ns = 0;
@@ -141,17 +139,18 @@ static PyObject* get_qualified_name(PyFrameObject *frame, PyCodeObject *code) {
 /* ============================================================================
  * Pattern Matching
  *
- * Calls into Python's _patterns.matches_any() for simplicity.
+ * Calls the matcher passed to install_setprofile() (a PatternSet's matches
+ * method), so the patterns are partitioned once rather than on every call.
  * Returns: 1 = match, 0 = no match, -1 = error
  * ============================================================================ */
 
 static int check_pattern_match(PyObject *module_name, PyObject *qualified_name) {
-    if (g_matches_any_func == NULL || g_target_patterns == NULL) {
+    if (g_matcher == NULL) {
         return 0;
     }
 
     PyObject *result = PyObject_CallFunctionObjArgs(
-        g_matches_any_func, g_target_patterns, module_name, qualified_name, NULL
+        g_matcher, module_name, qualified_name, NULL
     );
 
     if (result == NULL) {
@@ -282,7 +281,7 @@ PyDoc_STRVAR(install_doc,
 "\n"
 "Args:\n"
 "    config: A dict with keys:\n"
-"        - targets: List of TargetPattern objects\n"
+"        - matcher: Callable (module_name, qualified_name) -> bool\n"
 "        - delay_ns: Delay in nanoseconds (int)\n"
 "        - frequency: Trigger every Nth call (int, default 1)\n"
 "        - start_ns: Start time in nanoseconds (int, optional)\n"
@@ -303,14 +302,14 @@ static PyObject* py_install_setprofile(PyObject *self, PyObject *args) {
     }
 
     /* Extract configuration */
-    PyObject *targets = PyDict_GetItemString(config, "targets");
+    PyObject *matcher = PyDict_GetItemString(config, "matcher");
     PyObject *delay_obj = PyDict_GetItemString(config, "delay_ns");
     PyObject *freq_obj = PyDict_GetItemString(config, "frequency");
     PyObject *start_obj = PyDict_GetItemString(config, "start_ns");
     PyObject *end_obj = PyDict_GetItemString(config, "end_ns");
 
-    if (targets == NULL || !PyList_Check(targets)) {
-        PyErr_SetString(PyExc_ValueError, "config['targets'] must be a list");
+    if (matcher == NULL || !PyCallable_Check(matcher)) {
+        PyErr_SetString(PyExc_ValueError, "config['matcher'] must be callable");
         return NULL;
     }
 
@@ -340,25 +339,10 @@ static PyObject* py_install_setprofile(PyObject *self, PyObject *args) {
         g_end_ns = PyLong_AsLongLong(end_obj);
     }
 
-    /* Store targets reference */
-    Py_XDECREF(g_target_patterns);
-    Py_INCREF(targets);
-    g_target_patterns = targets;
-
-    /* Import pattern matching function */
-    if (g_patterns_module == NULL) {
-        g_patterns_module = PyImport_ImportModule("speed_bump._patterns");
-        if (g_patterns_module == NULL) {
-            return NULL;
-        }
-    }
-
-    if (g_matches_any_func == NULL) {
-        g_matches_any_func = PyObject_GetAttrString(g_patterns_module, "matches_any");
-        if (g_matches_any_func == NULL) {
-            return NULL;
-        }
-    }
+    /* Store matcher reference */
+    Py_XDECREF(g_matcher);
+    Py_INCREF(matcher);
+    g_matcher = matcher;
 
     /* Initialize call counters dict */
     if (g_frequency > 1) {
@@ -403,7 +387,7 @@ static PyObject* py_uninstall_setprofile(PyObject *self, PyObject *args) {
     PyEval_SetProfile(NULL, NULL);
 
     /* Clean up */
-    Py_CLEAR(g_target_patterns);
+    Py_CLEAR(g_matcher);
     Py_CLEAR(g_call_counters);
 
     g_installed = false;
@@ -21,18 +21,39 @@ from typing import Optional, Generator
 
 SYSFS_TARGETS = "/sys/kernel/speed_bump/targets"
 
+# Default probe PID, refreshed in fork children so it is always this process
+_pid = os.getpid()
+
+
+def _refresh_pid() -> None:
+    global _pid
+    _pid = os.getpid()
+
+
+os.register_at_fork(after_in_child=_refresh_pid)
+
 
 def _write_target(spec: str) -> None:
     """Write a target specification to the kernel module.
 
+    The spec goes out in a single os.write() so the kernel sees it as one
+    store, without the buffering and encoding layers of a text file object.
+
     Args:
         spec: The target specification string to write.
 
     Raises:
-        OSError: If the sysfs interface is not available or write fails.
+        OSError: If the sysfs interface is not available or write fails,
+            including a short write that would leave the spec truncated.
     """
-    with open(SYSFS_TARGETS, "w") as f:
-        f.write(spec)
+    data = os.fsencode(spec)
+    fd = os.open(SYSFS_TARGETS, os.O_WRONLY | os.O_CLOEXEC)
+    try:
+        written = os.write(fd, data)
+    finally:
+        os.close(fd)
+    if written != len(data):
+        raise OSError(f"short write to {SYSFS_TARGETS}: {written} of {len(data)} bytes")
 
 
 def add_probe(
@@ -53,7 +74,7 @@ def add_probe(
         OSError: If the sysfs interface is not available or write fails.
     """
     if pid is None:
-        pid = os.getpid()
+        pid = _pid
     spec = f"+{binary_path}:{symbol} {delay_ns} pid={pid}"
     _write_target(spec)
 
@@ -134,7 +155,7 @@ def format_add_spec(
         The formatted specification string.
     """
     if pid is None:
-        pid = os.getpid()
+        pid = _pid
     return f"+{binary_path}:{symbol} {delay_ns} pid={pid}"
 
 
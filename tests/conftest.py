@@ -3,11 +3,14 @@
 from __future__ import annotations
 
 import sys
+import time
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 import pytest
 
+import speed_bump
+
 if TYPE_CHECKING:
     pass
 
@@ -39,6 +42,36 @@ requires_gil_detection = pytest.mark.skipif(
 )
 
 
+# =============================================================================
+# Delay Measurement
+# =============================================================================
+
+
+def _perf_counter_overhead_ns(samples: int = 1000) -> int:
+    """Return the smallest gap between two back-to-back perf_counter_ns() calls."""
+    best = sys.maxsize
+    for _ in range(samples):
+        t0 = time.perf_counter_ns()
+        t1 = time.perf_counter_ns()
+        best = min(best, t1 - t0)
+    return best
+
+
+PERF_COUNTER_OVERHEAD_NS = _perf_counter_overhead_ns()
+
+
+def measure_delay(delay_ns: int) -> int:
+    """Time speed_bump.spin_delay_ns(delay_ns), less the cost of reading the clock.
+
+    The bracketing perf_counter_ns() calls add one call's worth of time to
+    the measured interval. The minimum overhead is subtracted rather than a
+    per-measurement one, so a slow clock read can't make a delay look short.
+    """
+    start = time.perf_counter_ns()
+    speed_bump.spin_delay_ns(delay_ns)
+    return time.perf_counter_ns() - start - PERF_COUNTER_OVERHEAD_NS
+
+
 @pytest.fixture
 def runtime_info() -> dict:
     """Return information about the Python runtime."""
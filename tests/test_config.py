@@ -60,6 +60,15 @@ class TestConfigEnabled:
         assert config.delay_ns == 1000
         assert config.frequency == 1
         assert config.end_ns is None  # indefinite
+        assert config.sleep is False
+
+    def test_sleep_enabled(self, sample_targets: Path) -> None:
+        """SPEED_BUMP_SLEEP=1 enables sleeping delays."""
+        env = {"SPEED_BUMP_TARGETS": str(sample_targets), "SPEED_BUMP_SLEEP": "1"}
+        with mock.patch.dict(os.environ, env, clear=True):
+            config = load_config()
+
+        assert config.sleep is True
 
     def test_targets_file_not_found(self, tmp_path: Path) -> None:
         """ConfigError raised when targets file doesn't exist."""
@@ -130,6 +139,39 @@ class TestConfigParsing:
         assert config.delay_ns >= speed_bump.min_delay_ns
 
 
+class TestConfigCache:
+    """Tests for load_config result caching."""
+
+    def test_repeated_load_returns_cached_config(self, sample_targets: Path) -> None:
+        """Unchanged environment returns the same Config object."""
+        env = {"SPEED_BUMP_TARGETS": str(sample_targets), "SPEED_BUMP_DELAY_NS": "5000"}
+        with mock.patch.dict(os.environ, env, clear=True):
+            first = load_config()
+            second = load_config()
+        assert first is second
+
+    def test_changed_environment_reloads(self, sample_targets: Path) -> None:
+        """Changing a SPEED_BUMP_* variable produces a new Config."""
+        env = {"SPEED_BUMP_TARGETS": str(sample_targets), "SPEED_BUMP_DELAY_NS": "5000"}
+        with mock.patch.dict(os.environ, env, clear=True):
+            first = load_config()
+            os.environ["SPEED_BUMP_DELAY_NS"] = "6000"
+            second = load_config()
+        assert first.delay_ns == 5000
+        assert second.delay_ns == 6000
+
+    def test_modified_targets_file_reloads(self, target_file: Path) -> None:
+        """Rewriting the targets file produces a new Config."""
+        target_file.write_text("mod:first\n")
+        env = {"SPEED_BUMP_TARGETS": str(target_file)}
+        with mock.patch.dict(os.environ, env, clear=True):
+            first = load_config()
+            target_file.write_text("mod:first\nmod:second\n")
+            second = load_config()
+        assert len(first.targets) == 1
+        assert len(second.targets) == 2
+
+
 class TestTimingWindow:
     """Tests for start delay and duration configuration."""
 
@@ -2,11 +2,8 @@
 
 from __future__ import annotations
 
-import time
-
 import pytest
-
-import speed_bump
+from conftest import measure_delay
 
 
 class TestSpinDelay:
@@ -14,20 +11,16 @@ class TestSpinDelay:
 
     def test_zero_delay_is_fast(self) -> None:
         """Zero delay should return almost immediately."""
-        start = time.perf_counter_ns()
-        speed_bump.spin_delay_ns(0)
-        elapsed = time.perf_counter_ns() - start
+        elapsed = measure_delay(0)
 
-        # Should complete in under 1ms even with measurement overhead
+        # Should complete in under 1ms
         assert elapsed < 1_000_000, f"Zero delay took {elapsed}ns"
 
     def test_delay_is_at_least_requested(self) -> None:
         """Delay should be at least as long as requested."""
         delay_ns = 10_000  # 10µs
 
-        start = time.perf_counter_ns()
-        speed_bump.spin_delay_ns(delay_ns)
-        elapsed = time.perf_counter_ns() - start
+        elapsed = measure_delay(delay_ns)
 
         assert elapsed >= delay_ns, f"Delay of {delay_ns}ns only took {elapsed}ns"
 
@@ -35,15 +28,12 @@ class TestSpinDelay:
         """Delay should not massively overshoot.
 
         We allow 2x the requested delay as upper bound. This accounts for:
-        - Measurement overhead
         - System scheduling jitter
         - Cache effects
         """
         delay_ns = 10_000  # 10µs
 
-        start = time.perf_counter_ns()
-        speed_bump.spin_delay_ns(delay_ns)
-        elapsed = time.perf_counter_ns() - start
+        elapsed = measure_delay(delay_ns)
 
         max_expected = delay_ns * 2
         assert elapsed < max_expected, f"Delay of {delay_ns}ns took {elapsed}ns (>{max_expected}ns)"
@@ -52,9 +42,7 @@ class TestSpinDelay:
         """Test accuracy for a longer delay (100µs)."""
         delay_ns = 100_000  # 100µs
 
-        start = time.perf_counter_ns()
-        speed_bump.spin_delay_ns(delay_ns)
-        elapsed = time.perf_counter_ns() - start
+        elapsed = measure_delay(delay_ns)
 
         # Should be within 50% of target for longer delays
         assert elapsed >= delay_ns
@@ -64,9 +52,7 @@ class TestSpinDelay:
         """Test a 1ms delay for reasonable accuracy."""
         delay_ns = 1_000_000  # 1ms
 
-        start = time.perf_counter_ns()
-        speed_bump.spin_delay_ns(delay_ns)
-        elapsed = time.perf_counter_ns() - start
+        elapsed = measure_delay(delay_ns)
 
         # Should be within 20% of target for ms-scale delays
         assert elapsed >= delay_ns
@@ -79,8 +65,6 @@ class TestSpinDelay:
     )
     def test_various_delays(self, delay_ns: int) -> None:
         """Test various delay durations are at least as long as requested."""
-        start = time.perf_counter_ns()
-        speed_bump.spin_delay_ns(delay_ns)
-        elapsed = time.perf_counter_ns() - start
+        elapsed = measure_delay(delay_ns)
 
         assert elapsed >= delay_ns, f"Delay of {delay_ns}ns only took {elapsed}ns"
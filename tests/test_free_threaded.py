@@ -17,16 +17,22 @@ Timing robustness:
 from __future__ import annotations
 
 import gc
+import os
+import statistics
 import sys
 import threading
 import time
 from collections.abc import Callable
 from concurrent.futures import ThreadPoolExecutor
+from types import CodeType
+
+import pytest
 
 # Import detection utilities from conftest
 from conftest import (
     is_free_threaded,
     is_gil_python,
+    measure_delay,
     requires_ftp,
     requires_gil,
     requires_gil_detection,
@@ -35,6 +41,25 @@ from conftest import (
 import speed_bump
 from speed_bump._patterns import parse_pattern
 
+# Shared by the FTP parallelism test and its GIL control so they measure the
+# same thing. The delay must stay well above thread wakeup cost (tens of µs),
+# or wakeup overhead alone could meet the GIL control's lower bound.
+PARALLELISM_DELAY_NS = 100_000  # 100μs per thread
+PARALLELISM_THREADS = 4
+
+# The setprofile backend only profiles the installing thread and has no
+# _core match cache
+requires_pep669 = pytest.mark.skipif(
+    sys.version_info < (3, 12), reason="Requires PEP 669 (Python 3.12+)"
+)
+
+
+def _available_cpus() -> list[int]:
+    """Return the CPUs this process may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
 
 def with_deflake(
     test_fn: Callable[[], None],
@@ -98,11 +123,9 @@ class TestRuntimeDetection:
 class TestDelayPerThread:
     """Tests that delay works correctly in each thread."""
 
-    def measure_delay(self, target_ns: int) -> int:
-        """Measure actual delay vs requested."""
-        start = time.perf_counter_ns()
-        speed_bump.spin_delay_ns(target_ns)
-        return time.perf_counter_ns() - start
+    def measure_delay(self, target_ns: int, samples: int = 5) -> int:
+        """Measure actual delay vs requested, as the median of several runs."""
+        return statistics.median_low(measure_delay(target_ns) for _ in range(samples))
 
     def test_delay_works_in_main_thread(self):
         """Claim: Delay works in main thread.
@@ -164,47 +187,57 @@ class TestFTPParallelism:
 
         This is the KEY FTP test - proves delays don't hold a global lock.
 
-        Uses two-barrier synchronisation to measure only spin delay time,
-        excluding thread startup/teardown overhead. GC disabled during timing.
+        Workers spin until a shared start time and stamp their own finish
+        time, so only spin delay time is measured: no thread startup or
+        teardown, and no condition variable wakeups. Where the OS allows
+        it, each worker is pinned to its own CPU so an oversubscribed
+        scheduler can't stack the spins on one core. GC disabled during
+        timing.
         Auto-deflake on overshoot failures.
         """
-        delay_ns = 100_000  # 100μs per thread
-        n_threads = 4
+        delay_ns = PARALLELISM_DELAY_NS
+        n_threads = PARALLELISM_THREADS
         serialised_would_be = delay_ns * n_threads
         max_expected = serialised_would_be * 0.6
 
+        cpus = _available_cpus()
+        if len(cpus) < n_threads:
+            pytest.skip(f"Needs {n_threads} CPUs to run delays in parallel, have {len(cpus)}")
+
         def is_overshoot(e: AssertionError) -> bool:
             # Any failure here is an overshoot (time too long)
             return True
 
         def run_test():
-            # Two barriers: one to synchronise start, one to synchronise end
-            start_barrier = threading.Barrier(n_threads + 1)
-            end_barrier = threading.Barrier(n_threads + 1)
-
-            def worker():
-                start_barrier.wait()
+            # Workers spin until a start time far enough ahead for all of
+            # them to be running, so they start within microseconds of each
+            # other instead of waking one by one from a barrier. A worker
+            # that starts late shows up as an overshoot.
+            finished = [0] * n_threads
+
+            def worker(i):
+                if hasattr(os, "sched_setaffinity"):
+                    os.sched_setaffinity(0, {cpus[i]})  # 0 = the calling thread
+                while time.perf_counter_ns() < start_at:
+                    pass
                 speed_bump.spin_delay_ns(delay_ns)
-                end_barrier.wait()
-
-            threads = [threading.Thread(target=worker) for _ in range(n_threads)]
-            for t in threads:
-                t.start()
+                finished[i] = time.perf_counter_ns()
 
             # Disable GC during timing-sensitive measurement
             gc_was_enabled = gc.isenabled()
             gc.disable()
             try:
-                start_barrier.wait()
-                wall_start = time.perf_counter_ns()
-                end_barrier.wait()
-                total = time.perf_counter_ns() - wall_start
+                start_at = time.perf_counter_ns() + 5_000_000  # 5ms
+                threads = [threading.Thread(target=worker, args=(i,)) for i in range(n_threads)]
+                for t in threads:
+                    t.start()
+                for t in threads:
+                    t.join()
             finally:
                 if gc_was_enabled:
                     gc.enable()
 
-            for t in threads:
-                t.join()
+            total = max(finished) - start_at
 
             # In FTP: total should be ~1xdelay (parallel)
             # In GIL: total would be ~Nxdelay (serialised)
@@ -228,8 +261,8 @@ class TestFTPParallelism:
         No deflake needed: GC would make time appear longer, not shorter,
         so cannot cause false negatives on a minimum-bound check.
         """
-        delay_ns = 100_000  # 100μs per thread
-        n_threads = 4
+        delay_ns = PARALLELISM_DELAY_NS
+        n_threads = PARALLELISM_THREADS
         min_expected = delay_ns * n_threads * 0.5  # At least half of serialised
 
         # Two barriers: one to synchronise start, one to synchronise end
@@ -274,11 +307,14 @@ class TestMatchCacheThreadSafety:
         """Claim: Match cache handles concurrent access safely.
         Falsification: Race condition would cause crash or exception.
         """
-        pattern = parse_pattern("test.*:*", 1)
+        # Patterns match on co_filename, so a module glob like "test.*"
+        # would never match this file; match the dummy by name instead so
+        # every call goes through the cache
+        pattern = parse_pattern("*:*.dummy", 1)
         config = speed_bump.Config(
             enabled=True,
             targets=(pattern,),
-            delay_ns=100,  # Very small delay
+            delay_ns=0,  # No delay, so the time goes on cache lookups
             frequency=1,
             start_ns=0,
             end_ns=None,
@@ -289,7 +325,7 @@ class TestMatchCacheThreadSafety:
 
         errors = []
         n_threads = 8
-        n_iterations = 100
+        n_iterations = 10_000
 
         def worker():
             try:
@@ -311,3 +347,213 @@ class TestMatchCacheThreadSafety:
         speed_bump.uninstall()
 
         assert len(errors) == 0, f"Thread safety errors: {errors}"
+
+    @requires_pep669
+    def test_concurrent_first_sight_of_distinct_code(self):
+        """Claim: Threads caching results for distinct code objects at the
+        same time all get a match and a delay.
+        Falsification: A lost or corrupted cache insert would leave some
+        thread's target undelayed, or crash.
+        """
+        pattern = parse_pattern("*:shard_target", 1)
+        config = speed_bump.Config(
+            enabled=True,
+            targets=(pattern,),
+            delay_ns=1_000_000,  # 1ms
+            frequency=1,
+            start_ns=0,
+            end_ns=None,
+        )
+
+        n_threads = 8
+
+        # One distinct code object per thread. They exist before install(),
+        # so install() enables them; clearing the cache afterwards leaves the
+        # first cached match to the threads.
+        targets = []
+        for i in range(n_threads):
+            ns = {}
+            exec(compile("def shard_target():\n    pass\n", f"<shard_{i}>", "exec"), ns)
+            targets.append(ns["shard_target"])
+
+        speed_bump.install(config)
+        speed_bump.clear_cache()
+
+        barrier = threading.Barrier(n_threads)
+        elapsed = []
+        errors = []
+
+        def worker(i):
+            try:
+                target = targets[i]
+                barrier.wait()
+                start = time.perf_counter_ns()
+                target()
+                elapsed.append(time.perf_counter_ns() - start)
+            except Exception as e:
+                errors.append(str(e))
+
+        try:
+            threads = [threading.Thread(target=worker, args=(i,)) for i in range(n_threads)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        finally:
+            speed_bump.uninstall()
+
+        assert errors == [], f"Thread safety errors: {errors}"
+        assert len(elapsed) == n_threads
+        assert min(elapsed) >= 800_000, f"A target was not delayed: {elapsed}"
+
+    @requires_pep669
+    def test_concurrent_cache_writes_all_persist(self):
+        """Claim: Results cached from many threads at once are all kept, each
+        on the right code object.
+        Falsification: A lost or torn co_extra write would make a matching
+        code object run the matcher again, or return the wrong result.
+        """
+        from speed_bump._core import check_match, set_matcher
+
+        n_threads = 16
+        per_thread = 64
+        codes = []
+        for i in range(n_threads * per_thread):
+            # Even functions match, odd ones don't
+            name = f"stress_match_{i}" if i % 2 == 0 else f"stress_skip_{i}"
+            module = compile(f"def {name}():\n    pass\n", f"<stress_{i}>", "exec")
+            codes.extend(c for c in module.co_consts if isinstance(c, CodeType))
+
+        calls = []
+        lock = threading.Lock()
+
+        def matcher(module_name: str, qualified_name: str) -> bool:
+            with lock:
+                calls.append(qualified_name)
+            return qualified_name.startswith("stress_match_")
+
+        barrier = threading.Barrier(n_threads)
+        errors = []
+
+        def worker(chunk):
+            try:
+                barrier.wait()
+                for code in chunk:
+                    check_match(code)
+            except Exception as e:
+                errors.append(str(e))
+
+        set_matcher(matcher)
+        try:
+            threads = [
+                threading.Thread(target=worker, args=(codes[i::n_threads],))
+                for i in range(n_threads)
+            ]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+            assert errors == [], f"Thread safety errors: {errors}"
+            assert len(calls) == len(codes)
+
+            # Matches are cached, so only the non-matches reach the matcher again
+            calls.clear()
+            results = [check_match(code) for code in codes]
+            assert results == [i % 2 == 0 for i in range(len(codes))]
+            assert sorted(calls) == sorted(c.co_qualname for c in codes[1::2])
+        finally:
+            set_matcher(None)
+
+    def test_concurrent_install_uninstall(self):
+        """Claim: install() and uninstall() from several threads at once leave
+        monitoring in a consistent state.
+        Falsification: Unserialised installs would race to claim the tool ID
+        (install() reports failure) or leave monitoring installed after
+        every thread's last uninstall().
+        """
+        pattern = parse_pattern("*:throwaway_target", 1)
+        config = speed_bump.Config(
+            enabled=True,
+            targets=(pattern,),
+            delay_ns=100,
+            frequency=1,
+            start_ns=0,
+            end_ns=None,
+        )
+
+        n_threads = 4
+        n_iterations = 5
+        barrier = threading.Barrier(n_threads)
+        failures = []
+
+        def worker():
+            try:
+                barrier.wait()
+                for _ in range(n_iterations):
+                    if not speed_bump.install(config):
+                        failures.append("install() returned False")
+                    speed_bump.uninstall()
+            except Exception as e:
+                failures.append(str(e))
+
+        try:
+            threads = [threading.Thread(target=worker) for _ in range(n_threads)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        finally:
+            speed_bump.uninstall()
+
+        assert failures == [], f"Concurrent install/uninstall failed: {failures}"
+        assert speed_bump.is_installed() is False
+        assert speed_bump.get_config() is None
+
+
+class TestCallCountersPerThread:
+    """Tests for per-thread frequency counting."""
+
+    def test_frequency_counted_per_thread(self):
+        """Claim: Each thread counts calls to a target independently.
+        Falsification: A shared counter would make some thread's calls reach
+        the Nth call and be delayed, although no thread makes N calls.
+        """
+        pattern = parse_pattern("*:*per_thread_counter_target", 1)
+        config = speed_bump.Config(
+            enabled=True,
+            targets=(pattern,),
+            delay_ns=5_000_000,  # 5ms
+            frequency=4,
+            start_ns=0,
+            end_ns=None,
+        )
+
+        def per_thread_counter_target():
+            pass
+
+        speed_bump.clear_cache()
+        speed_bump.install(config)
+
+        n_threads = 4
+        barrier = threading.Barrier(n_threads)
+        elapsed = []
+
+        def worker():
+            barrier.wait()
+            start = time.perf_counter_ns()
+            for _ in range(3):  # One short of the frequency
+                per_thread_counter_target()
+            elapsed.append(time.perf_counter_ns() - start)
+
+        try:
+            threads = [threading.Thread(target=worker) for _ in range(n_threads)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        finally:
+            speed_bump.uninstall()
+
+        assert len(elapsed) == n_threads
+        assert max(elapsed) < 4_000_000, f"A call was delayed: {elapsed}"
@@ -28,6 +28,16 @@ def _make_env(**extra: str) -> dict[str, str]:
     return env
 
 
+def _run_python(code: str, **env: str) -> subprocess.CompletedProcess[str]:
+    """Run code in a fresh interpreter with PYTHONPATH and the given env vars."""
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        env=_make_env(**env),
+    )
+
+
 class TestSubprocessIntegration:
     """Tests that run speed-bump in a subprocess with environment variables."""
 
@@ -39,22 +49,17 @@ class TestSubprocessIntegration:
             def target_func():
                 return 42
 
-            start = time.time_ns()
+            start = time.perf_counter_ns()
             for _ in range(1000):
                 target_func()
-            elapsed = time.time_ns() - start
+            elapsed = time.perf_counter_ns() - start
 
             # Without speed-bump, 1000 calls should be very fast
             print(elapsed)
             assert elapsed < 10_000_000, f"Took too long: {elapsed}ns"
         """)
 
-        result = subprocess.run(
-            [sys.executable, "-c", code],
-            capture_output=True,
-            text=True,
-            env=_make_env(),  # Empty means no SPEED_BUMP_TARGETS but includes PYTHONPATH
-        )
+        result = _run_python(code)  # No SPEED_BUMP_TARGETS
         assert result.returncode == 0, f"Failed: {result.stderr}"
 
     def test_speed_bump_with_targets_delays(self, tmp_path: Path) -> None:
@@ -74,25 +79,21 @@ class TestSubprocessIntegration:
             def target_func():
                 return 42
 
-            start = time.time_ns()
+            start = time.perf_counter_ns()
             for _ in range(10):
                 target_func()
-            elapsed = time.time_ns() - start
+            elapsed = time.perf_counter_ns() - start
 
             # With 100µs delay per call, 10 calls should take at least 500µs
             print(f"Elapsed: {elapsed}ns")
             assert elapsed >= 500_000, f"Too fast: {elapsed}ns, expected delays"
         """)
 
-        result = subprocess.run(
-            [sys.executable, "-c", code],
-            capture_output=True,
-            text=True,
-            env=_make_env(
-                SPEED_BUMP_TARGETS=str(targets_file),
-                SPEED_BUMP_DELAY_NS="100000",  # 100 microseconds
-                SPEED_BUMP_FREQUENCY="1",
-            ),
+        result = _run_python(
+            code,
+            SPEED_BUMP_TARGETS=str(targets_file),
+            SPEED_BUMP_DELAY_NS="100000",  # 100 microseconds
+            SPEED_BUMP_FREQUENCY="1",
         )
         assert result.returncode == 0, f"Failed: {result.stderr}\n{result.stdout}"
 
@@ -111,10 +112,10 @@ class TestSubprocessIntegration:
             def freq_func():
                 return 42
 
-            start = time.time_ns()
+            start = time.perf_counter_ns()
             for _ in range(100):
                 freq_func()
-            elapsed = time.time_ns() - start
+            elapsed = time.perf_counter_ns() - start
 
             # 100 calls with freq=10 means 10 delays of 100µs = 1ms
             # Should be between 0.5ms and 5ms
@@ -122,15 +123,11 @@ class TestSubprocessIntegration:
             assert 500_000 <= elapsed <= 10_000_000, f"Unexpected timing: {elapsed}ns"
         """)
 
-        result = subprocess.run(
-            [sys.executable, "-c", code],
-            capture_output=True,
-            text=True,
-            env=_make_env(
-                SPEED_BUMP_TARGETS=str(targets_file),
-                SPEED_BUMP_DELAY_NS="100000",
-                SPEED_BUMP_FREQUENCY="10",
-            ),
+        result = _run_python(
+            code,
+            SPEED_BUMP_TARGETS=str(targets_file),
+            SPEED_BUMP_DELAY_NS="100000",
+            SPEED_BUMP_FREQUENCY="10",
         )
         assert result.returncode == 0, f"Failed: {result.stderr}\n{result.stdout}"
 
@@ -150,25 +147,21 @@ class TestSubprocessIntegration:
                 return 42
 
             # Calls immediately after start - should not be delayed (start_ms=10000)
-            start = time.time_ns()
+            start = time.perf_counter_ns()
             for _ in range(100):
                 start_delay_func()
-            elapsed = time.time_ns() - start
+            elapsed = time.perf_counter_ns() - start
 
             # Should be fast since we're before the start window
             print(f"Elapsed: {elapsed}ns")
             assert elapsed < 10_000_000, f"Too slow: {elapsed}ns, should be before start window"
         """)
 
-        result = subprocess.run(
-            [sys.executable, "-c", code],
-            capture_output=True,
-            text=True,
-            env=_make_env(
-                SPEED_BUMP_TARGETS=str(targets_file),
-                SPEED_BUMP_DELAY_NS="100000",
-                SPEED_BUMP_START_MS="10000",  # 10 seconds in future
-            ),
+        result = _run_python(
+            code,
+            SPEED_BUMP_TARGETS=str(targets_file),
+            SPEED_BUMP_DELAY_NS="100000",
+            SPEED_BUMP_START_MS="10000",  # 10 seconds in future
         )
         assert result.returncode == 0, f"Failed: {result.stderr}\n{result.stdout}"
 
@@ -187,29 +180,28 @@ class TestSubprocessIntegration:
             def duration_func():
                 return 42
 
-            # Wait for duration window to end (1ms)
-            time.sleep(0.01)  # 10ms to be safe
+            # Wait for the duration window (1ms from import) to end, plus a
+            # kernel tick since the window is checked on a coarse clock.
+            # Importing speed_bump usually takes longer, so this rarely waits.
+            while time.time_ns() < config.end_ns + 5_000_000:
+                pass
 
             # Now calls should not be delayed
-            start = time.time_ns()
+            start = time.perf_counter_ns()
             for _ in range(100):
                 duration_func()
-            elapsed = time.time_ns() - start
+            elapsed = time.perf_counter_ns() - start
 
             # Should be fast since duration has passed
             print(f"Elapsed: {elapsed}ns")
             assert elapsed < 10_000_000, f"Too slow: {elapsed}ns, should be after duration"
         """)
 
-        result = subprocess.run(
-            [sys.executable, "-c", code],
-            capture_output=True,
-            text=True,
-            env=_make_env(
-                SPEED_BUMP_TARGETS=str(targets_file),
-                SPEED_BUMP_DELAY_NS="100000",
-                SPEED_BUMP_DURATION_MS="1",  # 1ms duration
-            ),
+        result = _run_python(
+            code,
+            SPEED_BUMP_TARGETS=str(targets_file),
+            SPEED_BUMP_DELAY_NS="100000",
+            SPEED_BUMP_DURATION_MS="1",  # 1ms duration
         )
         assert result.returncode == 0, f"Failed: {result.stderr}\n{result.stdout}"
 
@@ -228,24 +220,20 @@ class TestSubprocessIntegration:
             def other_func():
                 return 42
 
-            start = time.time_ns()
+            start = time.perf_counter_ns()
             for _ in range(1000):
                 other_func()
-            elapsed = time.time_ns() - start
+            elapsed = time.perf_counter_ns() - start
 
             # Should be fast since pattern doesn't match
             print(f"Elapsed: {elapsed}ns")
             assert elapsed < 10_000_000, f"Too slow: {elapsed}ns, pattern shouldn't match"
         """)
 
-        result = subprocess.run(
-            [sys.executable, "-c", code],
-            capture_output=True,
-            text=True,
-            env=_make_env(
-                SPEED_BUMP_TARGETS=str(targets_file),
-                SPEED_BUMP_DELAY_NS="1000000",  # 1ms per call would be obvious
-            ),
+        result = _run_python(
+            code,
+            SPEED_BUMP_TARGETS=str(targets_file),
+            SPEED_BUMP_DELAY_NS="1000000",  # 1ms per call would be obvious
         )
         assert result.returncode == 0, f"Failed: {result.stderr}\n{result.stdout}"
 
@@ -266,13 +254,9 @@ class TestErrorHandling:
             exit(1)
         """)
 
-        result = subprocess.run(
-            [sys.executable, "-c", code],
-            capture_output=True,
-            text=True,
-            env=_make_env(
-                SPEED_BUMP_TARGETS=str(tmp_path / "nonexistent.txt"),
-            ),
+        result = _run_python(
+            code,
+            SPEED_BUMP_TARGETS=str(tmp_path / "nonexistent.txt"),
         )
         assert result.returncode == 0, f"Failed: {result.stderr}"
         assert "file not found" in result.stdout.lower()
@@ -293,14 +277,10 @@ class TestErrorHandling:
             exit(1)
         """)
 
-        result = subprocess.run(
-            [sys.executable, "-c", code],
-            capture_output=True,
-            text=True,
-            env=_make_env(
-                SPEED_BUMP_TARGETS=str(targets_file),
-                SPEED_BUMP_DELAY_NS="not_a_number",
-            ),
+        result = _run_python(
+            code,
+            SPEED_BUMP_TARGETS=str(targets_file),
+            SPEED_BUMP_DELAY_NS="not_a_number",
         )
         assert result.returncode == 0, f"Failed: {result.stderr}"
         assert "invalid" in result.stdout.lower()
@@ -322,12 +302,7 @@ class TestCalibrationInSubprocess:
             assert speed_bump.is_calibrated()
         """)
 
-        result = subprocess.run(
-            [sys.executable, "-c", code],
-            capture_output=True,
-            text=True,
-            env=_make_env(),
-        )
+        result = _run_python(code)
         assert result.returncode == 0, f"Failed: {result.stderr}"
         assert "clock_overhead_ns:" in result.stdout
 
@@ -344,14 +319,10 @@ class TestCalibrationInSubprocess:
             assert config.delay_ns >= speed_bump.min_delay_ns
         """)
 
-        result = subprocess.run(
-            [sys.executable, "-c", code],
-            capture_output=True,
-            text=True,
-            env=_make_env(
-                SPEED_BUMP_TARGETS=str(targets_file),
-                SPEED_BUMP_DELAY_NS="1",  # Way below minimum
-            ),
+        result = _run_python(
+            code,
+            SPEED_BUMP_TARGETS=str(targets_file),
+            SPEED_BUMP_DELAY_NS="1",  # Way below minimum
         )
         assert result.returncode == 0, f"Failed: {result.stderr}"
         # Should have warning in stderr
@@ -13,12 +13,12 @@ import speed_bump
 from speed_bump import Config, clear_cache, install, is_installed, uninstall
 
 if TYPE_CHECKING:
-    pass
+    from types import CodeType
 
 # Skip marker for tests requiring PEP 669 (Python 3.12+)
 requires_pep669 = pytest.mark.skipif(
     sys.version_info < (3, 12),
-    reason="Requires PEP 669 (Python 3.12+) - clear_cache is no-op on setprofile backend"
+    reason="Requires PEP 669 (Python 3.12+) - clear_cache is no-op on setprofile backend",
 )
 
 
@@ -129,15 +129,48 @@ class TestCallbackFiring:
             return 42
 
         # Measure time for several calls
-        start = time.time_ns()
+        start = time.perf_counter_ns()
         for _ in range(10):
             target_function()
-        elapsed = time.time_ns() - start
+        elapsed = time.perf_counter_ns() - start
 
         # Should have added at least 10 * 100µs = 1ms of delay
         # Allow some tolerance for overhead
         assert elapsed >= 800_000  # At least 0.8ms
 
+    @requires_pep669
+    def test_sleep_mode_delays_without_spinning(self, tmp_path: Path) -> None:
+        """With sleep=True, long delays are applied but mostly off-CPU."""
+        from speed_bump._patterns import load_targets
+
+        targets_file = tmp_path / "targets.txt"
+        targets_file.write_text("*:*sleep_target_function\n")
+
+        now = time.time_ns()
+        config = Config(
+            enabled=True,
+            targets=tuple(load_targets(targets_file)),
+            delay_ns=5_000_000,  # 5ms
+            frequency=1,
+            start_ns=now - 1_000_000_000,
+            end_ns=None,
+            sleep=True,
+        )
+        install(config)
+
+        def sleep_target_function() -> int:
+            return 42
+
+        start = time.perf_counter_ns()
+        cpu_start = time.thread_time_ns()
+        for _ in range(4):
+            sleep_target_function()
+        cpu_elapsed = time.thread_time_ns() - cpu_start
+        elapsed = time.perf_counter_ns() - start
+
+        assert elapsed >= 20_000_000
+        assert cpu_elapsed < elapsed // 2, f"CPU {cpu_elapsed}ns of {elapsed}ns"
+
     def test_non_matching_function_not_delayed(self, tmp_path: Path) -> None:
         """A function not matching patterns is not delayed."""
         from speed_bump._patterns import load_targets
@@ -163,15 +196,227 @@ class TestCallbackFiring:
             return 42
 
         # Measure time for many calls
-        start = time.time_ns()
+        start = time.perf_counter_ns()
         for _ in range(1000):
             other_function()
-        elapsed = time.time_ns() - start
+        elapsed = time.perf_counter_ns() - start
 
         # Should be fast - definitely less than 10ms for 1000 calls
         # (would be 1000ms if delayed)
         assert elapsed < 10_000_000  # Less than 10ms
 
+    @requires_pep669
+    def test_handler_disables_non_matching_code(self, tmp_path: Path) -> None:
+        """The C handler returns DISABLE for non-matching code, None for targets."""
+        from speed_bump._core import py_start_handler
+
+        from speed_bump._patterns import load_targets
+
+        targets_file = tmp_path / "targets.txt"
+        targets_file.write_text("*:*handler_target\n")
+
+        config = Config(
+            enabled=True,
+            targets=tuple(load_targets(targets_file)),
+            delay_ns=1000,
+            frequency=1,
+            start_ns=0,
+            end_ns=None,
+        )
+        install(config)
+
+        def handler_target() -> None:
+            pass
+
+        def other_function() -> None:
+            pass
+
+        assert py_start_handler(handler_target.__code__, 0) is None
+        assert py_start_handler(other_function.__code__, 0) is sys.monitoring.DISABLE
+
+        uninstall()
+        assert py_start_handler(handler_target.__code__, 0) is None
+
+    @requires_pep669
+    def test_only_matching_code_is_instrumented(self, tmp_path: Path) -> None:
+        """PY_START is enabled locally on matching code objects only."""
+        from speed_bump._monitoring import TOOL_ID
+        from speed_bump._patterns import load_targets
+
+        targets_file = tmp_path / "targets.txt"
+        targets_file.write_text("*:*local_target\n")
+
+        def local_target() -> None:
+            pass
+
+        def other_function() -> None:
+            pass
+
+        config = Config(
+            enabled=True,
+            targets=tuple(load_targets(targets_file)),
+            delay_ns=1000,
+            frequency=1,
+            start_ns=0,
+            end_ns=None,
+        )
+        install(config)
+
+        py_start = sys.monitoring.events.PY_START
+        assert sys.monitoring.get_events(TOOL_ID) == 0
+        assert sys.monitoring.get_local_events(TOOL_ID, local_target.__code__) == py_start
+        assert sys.monitoring.get_local_events(TOOL_ID, other_function.__code__) == 0
+
+        uninstall()
+        assert sys.monitoring.get_local_events(TOOL_ID, local_target.__code__) == 0
+
+    @requires_pep669
+    def test_reinstall_keeps_registration(self, tmp_path: Path) -> None:
+        """The callback stays registered across uninstall and reinstall works."""
+        from speed_bump._monitoring import TOOL_ID
+        from speed_bump._patterns import load_targets
+
+        targets_file = tmp_path / "targets.txt"
+        targets_file.write_text("*:*reinstall_target\n")
+
+        def reinstall_target() -> None:
+            pass
+
+        def timed_call() -> int:
+            start = time.perf_counter_ns()
+            reinstall_target()
+            return time.perf_counter_ns() - start
+
+        config = Config(
+            enabled=True,
+            targets=tuple(load_targets(targets_file)),
+            delay_ns=2_000_000,  # 2ms
+            frequency=1,
+            start_ns=0,
+            end_ns=None,
+        )
+        install(config)
+        assert timed_call() >= 1_500_000
+
+        uninstall()
+        assert sys.monitoring.get_tool(TOOL_ID) == "speed_bump"
+        assert timed_call() < 1_500_000
+
+        install(config)
+        assert timed_call() >= 1_500_000
+
+    @requires_pep669
+    def test_install_leaves_other_tools_disabled(self, tmp_path: Path) -> None:
+        """Installing does not re-arm locations another tool disabled."""
+        from speed_bump._monitoring import TOOL_ID
+        from speed_bump._patterns import load_targets
+
+        other_tool = next(
+            t for t in range(6) if t != TOOL_ID and sys.monitoring.get_tool(t) is None
+        )
+        events = sys.monitoring.events
+        seen = []
+
+        def other_callback(code: CodeType, offset: int) -> object:
+            seen.append(code.co_name)
+            return sys.monitoring.DISABLE
+
+        def other_tool_target() -> None:
+            pass
+
+        targets_file = tmp_path / "targets.txt"
+        targets_file.write_text("*:*not_other_tool_target\n")
+        config = Config(
+            enabled=True,
+            targets=tuple(load_targets(targets_file)),
+            delay_ns=1000,
+            frequency=1,
+            start_ns=0,
+            end_ns=None,
+        )
+
+        sys.monitoring.use_tool_id(other_tool, "other_tool")
+        try:
+            sys.monitoring.register_callback(other_tool, events.PY_START, other_callback)
+            sys.monitoring.set_local_events(other_tool, other_tool_target.__code__, events.PY_START)
+            other_tool_target()
+            assert seen == ["other_tool_target"]
+
+            install(config)
+            uninstall()
+            install(config)
+            other_tool_target()
+            assert seen == ["other_tool_target"]
+        finally:
+            uninstall()
+            sys.monitoring.set_local_events(other_tool, other_tool_target.__code__, 0)
+            sys.monitoring.register_callback(other_tool, events.PY_START, None)
+            sys.monitoring.free_tool_id(other_tool)
+
+    @requires_pep669
+    def test_module_imported_after_install_is_monitored(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Code imported after install is picked up and delayed."""
+        from speed_bump._patterns import load_targets
+
+        targets_file = tmp_path / "targets.txt"
+        targets_file.write_text("*late_module.py:late_target\n")
+        (tmp_path / "late_module.py").write_text("def late_target():\n    return 42\n")
+        monkeypatch.syspath_prepend(str(tmp_path))
+
+        config = Config(
+            enabled=True,
+            targets=tuple(load_targets(targets_file)),
+            delay_ns=100_000,  # 100µs
+            frequency=1,
+            start_ns=0,
+            end_ns=None,
+        )
+        install(config)
+
+        import late_module
+
+        try:
+            start = time.perf_counter_ns()
+            for _ in range(10):
+                late_module.late_target()
+            elapsed = time.perf_counter_ns() - start
+        finally:
+            del sys.modules["late_module"]
+
+        assert elapsed >= 800_000  # At least 0.8ms
+
+    @requires_pep669
+    def test_uninstall_restores_loaders(self, tmp_path: Path) -> None:
+        """uninstall() puts back the loader methods install() wrapped."""
+        from importlib.machinery import SourceFileLoader, SourcelessFileLoader
+
+        from speed_bump._patterns import load_targets
+
+        targets_file = tmp_path / "targets.txt"
+        targets_file.write_text("*:nothing_matches_this\n")
+        before = {
+            loader: loader.__dict__.get("get_code")
+            for loader in (SourceFileLoader, SourcelessFileLoader)
+        }
+
+        config = Config(
+            enabled=True,
+            targets=tuple(load_targets(targets_file)),
+            delay_ns=100_000,
+            frequency=1,
+            start_ns=0,
+            end_ns=None,
+        )
+        install(config)
+        install(config)
+        assert SourceFileLoader.__dict__.get("get_code") is not None
+        uninstall()
+
+        for loader, get_code in before.items():
+            assert loader.__dict__.get("get_code") is get_code
+
 
 class TestFrequency:
     """Tests for frequency (every Nth call) behavior."""
@@ -199,15 +444,54 @@ class TestFrequency:
             return 42
 
         # 100 calls with frequency=10 means 10 delays of 100µs = 1ms total
-        start = time.time_ns()
+        start = time.perf_counter_ns()
         for _ in range(100):
             freq_test_function()
-        elapsed = time.time_ns() - start
+        elapsed = time.perf_counter_ns() - start
 
         # Should be around 1ms, not 10ms
         # Allow tolerance: between 0.5ms and 5ms
         assert 500_000 <= elapsed <= 5_000_000
 
+    def test_frequency_counts_per_code_object(self, tmp_path: Path) -> None:
+        """Each matching function has its own call counter."""
+        from speed_bump._patterns import load_targets
+
+        targets_file = tmp_path / "targets.txt"
+        targets_file.write_text("*:*freq_counter_*\n")
+
+        targets = load_targets(targets_file)
+        now = time.time_ns()
+        config = Config(
+            enabled=True,
+            targets=tuple(targets),
+            delay_ns=5_000_000,  # 5ms
+            frequency=10,
+            start_ns=now - 1_000_000_000,
+            end_ns=None,
+        )
+        install(config)
+
+        def freq_counter_a() -> int:
+            return 1
+
+        def freq_counter_b() -> int:
+            return 2
+
+        # 9 calls each: neither function reaches its 10th call
+        start = time.perf_counter_ns()
+        for _ in range(9):
+            freq_counter_a()
+            freq_counter_b()
+        elapsed = time.perf_counter_ns() - start
+        assert elapsed < 5_000_000
+
+        # The 10th call to one function is delayed
+        start = time.perf_counter_ns()
+        freq_counter_a()
+        elapsed = time.perf_counter_ns() - start
+        assert elapsed >= 4_000_000
+
 
 class TestTimingWindow:
     """Tests for timing window behavior."""
@@ -234,10 +518,10 @@ class TestTimingWindow:
         def window_test_function() -> int:
             return 42
 
-        start = time.time_ns()
+        start = time.perf_counter_ns()
         for _ in range(100):
             window_test_function()
-        elapsed = time.time_ns() - start
+        elapsed = time.perf_counter_ns() - start
 
         # Should be fast - no delays since we're before start
         assert elapsed < 10_000_000  # Less than 10ms
@@ -264,14 +548,124 @@ class TestTimingWindow:
         def window_end_test() -> int:
             return 42
 
-        start = time.time_ns()
+        start = time.perf_counter_ns()
         for _ in range(100):
             window_end_test()
-        elapsed = time.time_ns() - start
+        elapsed = time.perf_counter_ns() - start
 
         # Should be fast - no delays since window has ended
         assert elapsed < 10_000_000  # Less than 10ms
 
+    @requires_pep669
+    def test_handler_disables_after_end(self, tmp_path: Path) -> None:
+        """The handler keeps monitoring before the start, and disables after the end."""
+        from speed_bump._core import py_start_handler
+
+        from speed_bump._patterns import load_targets
+
+        targets_file = tmp_path / "targets.txt"
+        targets_file.write_text("*:*window_edge_target\n")
+        targets = tuple(load_targets(targets_file))
+
+        def window_edge_target() -> None:
+            pass
+
+        now = time.time_ns()
+        before_start = Config(
+            enabled=True,
+            targets=targets,
+            delay_ns=1000,
+            frequency=1,
+            start_ns=now + 10_000_000_000,  # 10s in future
+            end_ns=now + 20_000_000_000,
+        )
+        install(before_start)
+        assert py_start_handler(window_edge_target.__code__, 0) is None
+
+        after_end = Config(
+            enabled=True,
+            targets=targets,
+            delay_ns=1000,
+            frequency=1,
+            start_ns=now - 2_000_000_000,  # 2s ago
+            end_ns=now - 1_000_000_000,  # 1s ago (ended)
+        )
+        install(after_end)
+        assert py_start_handler(window_edge_target.__code__, 0) is sys.monitoring.DISABLE
+
+    @requires_pep669
+    def test_reinstall_rearms_code_disabled_after_end(self, tmp_path: Path) -> None:
+        """A target disabled once the window ended is delayed again after reinstall."""
+        from speed_bump._patterns import load_targets
+
+        targets_file = tmp_path / "targets.txt"
+        targets_file.write_text("*:*rearm_target\n")
+        targets = tuple(load_targets(targets_file))
+
+        def rearm_target() -> None:
+            pass
+
+        now = time.time_ns()
+        ended = Config(
+            enabled=True,
+            targets=targets,
+            delay_ns=2_000_000,  # 2ms
+            frequency=1,
+            start_ns=now - 2_000_000_000,
+            end_ns=now - 1_000_000_000,
+        )
+        install(ended)
+        rearm_target()  # The handler returns DISABLE for it
+
+        open_ended = Config(
+            enabled=True,
+            targets=targets,
+            delay_ns=2_000_000,  # 2ms
+            frequency=1,
+            start_ns=0,
+            end_ns=None,
+        )
+        install(open_ended)
+        start = time.perf_counter_ns()
+        rearm_target()
+        assert time.perf_counter_ns() - start >= 1_500_000
+
+    def test_window_opens_after_start(self, tmp_path: Path) -> None:
+        """Calls before start are not delayed; calls after start are."""
+        from speed_bump._patterns import load_targets
+
+        targets_file = tmp_path / "targets.txt"
+        targets_file.write_text("*:*window_open_test\n")
+
+        targets = load_targets(targets_file)
+        now = time.time_ns()
+        config = Config(
+            enabled=True,
+            targets=tuple(targets),
+            delay_ns=100_000,  # 100µs
+            frequency=1,
+            start_ns=now + 50_000_000,  # 50ms from now
+            end_ns=None,
+        )
+        install(config)
+
+        def window_open_test() -> int:
+            return 42
+
+        start = time.perf_counter_ns()
+        window_open_test()
+        before_elapsed = time.perf_counter_ns() - start
+
+        time.sleep(0.06)
+
+        start = time.perf_counter_ns()
+        for _ in range(10):
+            window_open_test()
+        after_elapsed = time.perf_counter_ns() - start
+
+        assert before_elapsed < 100_000
+        assert after_elapsed >= 800_000  # At least 0.8ms
+
 
 class TestCaching:
     """Tests for match result caching."""
@@ -322,14 +716,46 @@ class TestCaching:
         install(config2)
 
         # Should not be delayed with new config
-        start = time.time_ns()
+        start = time.perf_counter_ns()
         for _ in range(100):
             cached_function()
-        elapsed = time.time_ns() - start
+        elapsed = time.perf_counter_ns() - start
 
         # Should be fast since new targets don't match
         assert elapsed < 10_000_000
 
+    @requires_pep669
+    def test_matcher_runs_once_per_code_object(self) -> None:
+        """Matches are cached on the code object until cleared; non-matches are not."""
+        from speed_bump._core import check_match, set_matcher
+
+        calls: list[str] = []
+
+        def matcher(module_name: str, qualified_name: str) -> bool:
+            calls.append(qualified_name)
+            return qualified_name.endswith("cached_target")
+
+        def cached_target() -> None:
+            pass
+
+        def other_function() -> None:
+            pass
+
+        set_matcher(matcher)
+        try:
+            assert check_match(cached_target.__code__) is True
+            assert check_match(cached_target.__code__) is True
+            assert len(calls) == 1
+            assert check_match(other_function.__code__) is False
+            assert check_match(other_function.__code__) is False
+            assert len(calls) == 3
+
+            clear_cache()
+            assert check_match(cached_target.__code__) is True
+            assert len(calls) == 4
+        finally:
+            set_matcher(None)
+
 
 class TestGetConfig:
     """Tests for get_config function."""
@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+import contextlib
 import os
+from collections.abc import Iterator
 from unittest import mock
 
 import pytest
@@ -24,6 +26,21 @@ class TestSpecFormatting:
         expected_pid = os.getpid()
         assert spec == f"+/usr/bin/python3:PyObject_GetAttr 1000 pid={expected_pid}"
 
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="Requires os.fork")
+    def test_format_add_spec_default_pid_after_fork(self) -> None:
+        """Test the default PID in a forked child is the child's own."""
+        read_fd, write_fd = os.pipe()
+        child = os.fork()
+        if child == 0:
+            os.close(read_fd)
+            os.write(write_fd, native.format_add_spec("/bin/x", "f", 1).encode())
+            os._exit(0)
+        os.close(write_fd)
+        with os.fdopen(read_fd, "rb") as f:
+            spec = f.read().decode()
+        os.waitpid(child, 0)
+        assert spec == f"+/bin/x:f 1 pid={child}"
+
     def test_format_add_spec_zero_delay(self) -> None:
         """Test add spec formatting with zero delay."""
         spec = native.format_add_spec("/path/to/binary", "some_func", 0, pid=1)
@@ -35,24 +52,52 @@ class TestSpecFormatting:
         assert spec == "-/usr/bin/python3:PyObject_GetAttr"
 
 
+@contextlib.contextmanager
+def mock_sysfs(max_write: int | None = None) -> Iterator[tuple[mock.Mock, list[bytes]]]:
+    """Stand in for the sysfs file, collecting the bytes written to it.
+
+    Each os.write accepts at most max_write bytes, if given. Yields the
+    mocked os.open and the list of writes, in order.
+    """
+    writes: list[bytes] = []
+
+    def write(fd: int, data: bytes) -> int:
+        data = data[:max_write]
+        writes.append(data)
+        return len(data)
+
+    with (
+        mock.patch.object(native.os, "open", return_value=99) as mock_open,
+        mock.patch.object(native.os, "write", side_effect=write),
+        mock.patch.object(native.os, "close") as mock_close,
+    ):
+        yield mock_open, writes
+        assert mock_close.call_count == mock_open.call_count
+
+
 class TestAddProbe:
     """Tests for add_probe function."""
 
     def test_add_probe_writes_correct_spec(self) -> None:
         """Test add_probe writes the correct spec to sysfs."""
-        with mock.patch("builtins.open", mock.mock_open()) as mock_file:
+        with mock_sysfs() as (mock_open, writes):
             native.add_probe("/usr/bin/python3", "PyObject_GetAttr", 1000, pid=42)
-            mock_file.assert_called_once_with(native.SYSFS_TARGETS, "w")
-            mock_file().write.assert_called_once_with(
-                "+/usr/bin/python3:PyObject_GetAttr 1000 pid=42"
-            )
+            mock_open.assert_called_once_with(native.SYSFS_TARGETS, os.O_WRONLY | os.O_CLOEXEC)
+            assert writes == [b"+/usr/bin/python3:PyObject_GetAttr 1000 pid=42"]
 
     def test_add_probe_uses_current_pid_by_default(self) -> None:
         """Test add_probe uses current PID when not specified."""
-        with mock.patch("builtins.open", mock.mock_open()) as mock_file:
+        with mock_sysfs() as (_, writes):
             native.add_probe("/usr/bin/python3", "PyObject_GetAttr", 500)
             expected_spec = f"+/usr/bin/python3:PyObject_GetAttr 500 pid={os.getpid()}"
-            mock_file().write.assert_called_once_with(expected_spec)
+            assert writes == [expected_spec.encode()]
+
+    def test_add_probe_short_write_raises(self) -> None:
+        """Test add_probe raises rather than leave a truncated spec unreported."""
+        with mock_sysfs(max_write=8) as (_, writes):
+            with pytest.raises(OSError, match="short write"):
+                native.add_probe("/usr/bin/python3", "PyObject_GetAttr", 1000, pid=42)
+            assert writes == [b"+/usr/bi"]
 
 
 class TestRemoveProbe:
@@ -60,10 +105,10 @@ class TestRemoveProbe:
 
     def test_remove_probe_writes_correct_spec(self) -> None:
         """Test remove_probe writes the correct spec to sysfs."""
-        with mock.patch("builtins.open", mock.mock_open()) as mock_file:
+        with mock_sysfs() as (mock_open, writes):
             native.remove_probe("/usr/bin/python3", "PyObject_GetAttr")
-            mock_file.assert_called_once_with(native.SYSFS_TARGETS, "w")
-            mock_file().write.assert_called_once_with("-/usr/bin/python3:PyObject_GetAttr")
+            mock_open.assert_called_once_with(native.SYSFS_TARGETS, os.O_WRONLY | os.O_CLOEXEC)
+            assert writes == [b"-/usr/bin/python3:PyObject_GetAttr"]
 
 
 class TestProbeContextManager:
@@ -71,28 +116,24 @@ class TestProbeContextManager:
 
     def test_probe_context_manager_adds_and_removes(self) -> None:
         """Test probe context manager adds on entry and removes on exit."""
-        with mock.patch("builtins.open", mock.mock_open()) as mock_file:
+        with mock_sysfs() as (_, writes):
             with native.probe("/usr/bin/python3", "func", delay_ns=100, pid=123):
                 # Inside context - add should have been called
                 pass
 
             # Check both add and remove were called
-            calls = mock_file().write.call_args_list
-            assert len(calls) == 2
-            assert calls[0][0][0] == "+/usr/bin/python3:func 100 pid=123"
-            assert calls[1][0][0] == "-/usr/bin/python3:func"
+            assert writes == [b"+/usr/bin/python3:func 100 pid=123", b"-/usr/bin/python3:func"]
 
     def test_probe_context_manager_removes_on_exception(self) -> None:
         """Test probe context manager removes even if exception occurs."""
-        with mock.patch("builtins.open", mock.mock_open()) as mock_file:
+        with mock_sysfs() as (_, writes):
             with pytest.raises(ValueError, match="test exception"):
                 with native.probe("/bin/test", "sym", delay_ns=50, pid=1):
                     raise ValueError("test exception")
 
             # Remove should still have been called
-            calls = mock_file().write.call_args_list
-            assert len(calls) == 2
-            assert calls[1][0][0] == "-/bin/test:sym"
+            assert len(writes) == 2
+            assert writes[1] == b"-/bin/test:sym"
 
 
 class TestIsAvailable:
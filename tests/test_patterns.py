@@ -8,6 +8,7 @@ import pytest
 
 from speed_bump._patterns import (
     PatternError,
+    PatternSet,
     TargetPattern,
     load_targets,
     matches_any,
@@ -99,6 +100,24 @@ class TestTargetPatternMatching:
         assert pattern.matches("modele", "func") is True
         assert pattern.matches("modle", "func") is False
 
+    @pytest.mark.parametrize(
+        ("name_pattern", "name", "expected"),
+        [
+            ("forward", "forward", True),
+            ("forward", "forward2", False),
+            ("Llama*", "LlamaMLP", True),
+            ("Llama*", "MyLlama", False),
+            ("*.forward", "Model.forward", True),
+            ("*.forward", "Model.forward_pre", False),
+            ("*Mid*", "AMidB", True),
+            ("*Mid*", "AmidB", False),
+        ],
+    )
+    def test_glob_shapes(self, name_pattern: str, name: str, expected: bool) -> None:
+        """Literal, prefix, suffix and general globs all match like fnmatch."""
+        pattern = TargetPattern("mod", name_pattern, f"mod:{name_pattern}")
+        assert pattern.matches("mod", name) is expected
+
 
 class TestLoadTargets:
     """Tests for load_targets function."""
@@ -140,6 +159,19 @@ another.valid:pattern
             load_targets(target_file)
         assert "Line 2" in str(exc_info.value)
 
+    def test_error_line_number_counts_skipped_lines(self, target_file: Path) -> None:
+        """Blank and comment lines still count toward error line numbers."""
+        target_file.write_text("# header\n\n  \nmod:func\n  # indented comment\nbroken\n")
+        with pytest.raises(PatternError) as exc_info:
+            load_targets(target_file)
+        assert "Line 6" in str(exc_info.value)
+
+    def test_crlf_line_endings(self, target_file: Path) -> None:
+        """Windows line endings are handled."""
+        target_file.write_bytes(b"# comment\r\nmod:func\r\n\r\nother:*\r\n")
+        patterns = load_targets(target_file)
+        assert [p.original for p in patterns] == ["mod:func", "other:*"]
+
 
 class TestMatchesAny:
     """Tests for matches_any function."""
@@ -171,3 +203,66 @@ class TestMatchesAny:
     def test_empty_patterns(self) -> None:
         """Empty pattern list returns False."""
         assert matches_any([], "module", "func") is False
+
+
+class TestPatternSet:
+    """Tests for the shape-partitioned pattern set."""
+
+    @pytest.mark.parametrize(
+        ("module_name", "qualified_name", "expected"),
+        [
+            ("mod", "exact_func", True),
+            ("mod", "exact_func2", False),
+            ("mod", "Cls.method", True),
+            ("other", "Cls.method", False),
+            ("pkg.sub", "anything", True),
+            ("pkg", "anything", False),
+        ],
+    )
+    def test_matches_each_partition(
+        self, module_name: str, qualified_name: str, expected: bool
+    ) -> None:
+        """Exact, literal-module and wildcard-module patterns all match."""
+        patterns = PatternSet(
+            [
+                TargetPattern("mod", "exact_func", "mod:exact_func"),
+                TargetPattern("mod", "Cls.*", "mod:Cls.*"),
+                TargetPattern("pkg.*", "*", "pkg.*:*"),
+            ]
+        )
+        assert patterns.matches(module_name, qualified_name) is expected
+
+    def test_wildcard_modules_resolved_per_module(self) -> None:
+        """Name patterns from every wildcard module glob matching a module apply."""
+        patterns = PatternSet(
+            [
+                TargetPattern("pkg.*", "a*", "pkg.*:a*"),
+                TargetPattern("*", "b", "*:b"),
+            ]
+        )
+        # Repeated lookups hit the per-module memo
+        for _ in range(2):
+            assert patterns.matches("pkg.x", "a1") is True
+            assert patterns.matches("pkg.x", "b") is True
+            assert patterns.matches("pkg.x", "c") is False
+            assert patterns.matches("other", "a1") is False
+            assert patterns.matches("other", "b") is True
+
+    def test_wildcard_module_glob_shared_by_names(self) -> None:
+        """Name patterns that share a wildcard module glob are all kept."""
+        patterns = PatternSet(
+            [
+                TargetPattern("pkg.*", "a", "pkg.*:a"),
+                TargetPattern("other.*", "b", "other.*:b"),
+                TargetPattern("pkg.*", "c*", "pkg.*:c*"),
+            ]
+        )
+        assert patterns.matches("pkg.x", "a") is True
+        assert patterns.matches("pkg.x", "c1") is True
+        assert patterns.matches("pkg.x", "b") is False
+        assert patterns.matches("other.y", "b") is True
+        assert patterns.matches("other.y", "a") is False
+
+    def test_empty_set_never_matches(self) -> None:
+        """An empty pattern set matches nothing."""
+        assert PatternSet([]).matches("", "") is False